@@ -66,6 +66,15 @@ DEEPSEEK_ENABLED = bool(DEEPSEEK_API_KEY)
 # =============================================================================
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 DATABASE_ENABLED = bool(DATABASE_URL)
+DATABASE_POOL_MIN_SIZE = int(os.getenv("DATABASE_POOL_MIN_SIZE", "2"))
+DATABASE_POOL_MAX_SIZE = int(os.getenv("DATABASE_POOL_MAX_SIZE", "20"))
+# Idle pooled connections are closed after this many seconds
+DATABASE_POOL_MAX_IDLE = float(os.getenv("DATABASE_POOL_MAX_IDLE", "300"))
+DATABASE_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "1024"))
+# Per-statement timeouts (seconds): the default, and a longer one for
+# stats and exports
+DATABASE_COMMAND_TIMEOUT = float(os.getenv("DATABASE_COMMAND_TIMEOUT", "30"))
+DATABASE_ANALYTICS_TIMEOUT = float(os.getenv("DATABASE_ANALYTICS_TIMEOUT", "60"))
 
 # =============================================================================
 # RESEND EMAIL
@@ -175,11 +184,19 @@ AUTH_REQUIRED_FOR_WRITES = (
 # =============================================================================
 # JWT AUTHENTICATION (fallback/internal)
 # =============================================================================
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", secrets.token_urlsafe(32))
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "")
+if not JWT_SECRET_KEY:
+    # A generated key invalidates every issued token on each restart and
+    # differs between worker processes, so production must configure one
+    if APP_ENV == "production":
+        raise RuntimeError("JWT_SECRET_KEY must be set when APP_ENV=production")
+    JWT_SECRET_KEY = secrets.token_urlsafe(32)
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60480")
 )  # 7 days
+# Clock skew tolerated on exp/iat/nbf when verifying Auth0 and internal JWTs
+JWT_LEEWAY_SECONDS = int(os.getenv("JWT_LEEWAY_SECONDS", "30"))
 
 # =============================================================================
 # OAUTH STATE (CSRF protection)
@@ -1035,8 +1035,10 @@ async def github_callback(code: str, state: str):
         # Exchange code for access token
         token_response = await auth_service.exchange_code_for_token(code, state)
 
-        # Get user profile from GitHub
-        github_user = await auth_service.get_github_user(token_response.access_token)
+        # Get user profile (and emails, for a private email) from GitHub
+        github_user, _ = await auth_service.get_github_user_and_emails(
+            token_response.access_token
+        )
 
         # Create user session and JWT
         access_token, auth_user = auth_service.create_user_session(github_user)
@@ -1084,8 +1086,10 @@ async def github_callback_post(request: dict):
             code, state, redirect_uri=redirect_uri
         )
 
-        # Get user profile from GitHub
-        github_user = await auth_service.get_github_user(token_response.access_token)
+        # Get user profile (and emails, for a private email) from GitHub
+        github_user, _ = await auth_service.get_github_user_and_emails(
+            token_response.access_token
+        )
 
         # Create user session and JWT
         access_token, auth_user = auth_service.create_user_session(github_user)
@@ -1296,6 +1300,11 @@ async def get_audit_logs(
     status: Optional[str] = None,
     page: int = 1,
     page_size: int = 100,
+    after_timestamp: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+    correlation_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+    with_total: bool = True,
     _user: dict = Depends(require_user_for_write),
 ):
     """
@@ -1313,6 +1322,12 @@ async def get_audit_logs(
         status: Filter by status (success, failed, pending)
         page: Page number for pagination
         page_size: Number of results per page
+        after_timestamp, after_id: The previous page's next_cursor; pages
+            through deep results faster than page numbers
+        correlation_id: Filter by request correlation ID (X-Correlation-ID)
+        request_id: Filter by request ID
+        with_total: Set to false to skip counting the matching logs
+            (total_count is then null); has_more is always set
 
     Returns paginated list of audit log entries.
     """
@@ -1336,6 +1351,11 @@ async def get_audit_logs(
         status=status,
         page=page,
         page_size=page_size,
+        after_timestamp=after_timestamp,
+        after_id=after_id,
+        correlation_id=correlation_id,
+        request_id=request_id,
+        with_total=with_total,
     )
 
     return result
@@ -1481,6 +1501,24 @@ async def admin_whoami(
     return result
 
 
+# Columns of the admin CSV export (AuditLog field names)
+ADMIN_EXPORT_FIELDS = (
+    "id",
+    "timestamp",
+    "event_type",
+    "user_id",
+    "resource_type",
+    "resource_id",
+    "status",
+    "thread_id",
+    "post_id",
+    "ip_address",
+    "user_agent",
+    "details",
+    "error_message",
+)
+
+
 @app.get("/admin/audit/logs/export", tags=["Audit"])
 async def export_audit_logs(
     format: str = "json",
@@ -1499,8 +1537,7 @@ async def export_audit_logs(
     Returns downloadable file with audit logs.
     """
     from datetime import datetime
-    from fastapi.responses import Response
-    import json
+    from fastapi.responses import StreamingResponse
 
     from services.audit_service import audit_service
 
@@ -1508,69 +1545,23 @@ async def export_audit_logs(
     start_dt = datetime.fromisoformat(start_date) if start_date else None
     end_dt = datetime.fromisoformat(end_date) if end_date else None
 
-    # Get all logs (no pagination for export)
-    result = audit_service.get_logs_sync(
-        start_date=start_dt, end_date=end_dt, page_size=100000
-    )
-
     if format == "csv":
-        import io
-
-        import csv
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
-                "id",
-                "timestamp",
-                "event_type",
-                "user_id",
-                "resource_type",
-                "resource_id",
-                "status",
-                "thread_id",
-                "post_id",
-                "ip_address",
-                "user_agent",
-                "details",
-                "error_message",
-            ]
-        )
-        for log in result["logs"]:
-            writer.writerow(
-                [
-                    log.id,
-                    log.timestamp,
-                    log.event_type.value,
-                    log.user_id,
-                    log.resource_type,
-                    log.resource_id,
-                    log.status,
-                    log.thread_id,
-                    log.post_id,
-                    log.ip_address,
-                    log.user_agent,
-                    json.dumps(log.details),
-                    log.error_message,
-                ]
-            )
-
-        return Response(
-            content=output.getvalue(),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=audit_logs.csv"},
-        )
+        media_type, filename = "text/csv", "audit_logs.csv"
+    else:
+        # Default to JSON
+        format, media_type, filename = "json", "application/json", "audit_logs.json"
 
-    # Default to JSON
-    return Response(
-        content=json.dumps(
-            [log.dict() for log in result["logs"]],
-            default=str,
-            indent=2,
+    # Stream the export record by record instead of building it in memory
+    return StreamingResponse(
+        audit_service.export_logs_aiter(
+            start_date=start_dt,
+            end_date=end_dt,
+            format=format,
+            limit=100000,
+            fields=ADMIN_EXPORT_FIELDS,
         ),
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=audit_logs.json"},
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
@@ -1927,6 +1918,25 @@ async def startup_event():
     )
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown"""
+    if DATABASE_ENABLED:
+        from services.database_service import database_service
+        from services.audit_service import audit_service
+
+        # Write out queued audit logs before the pool goes away
+        await audit_service.flush()
+        await database_service.close()
+
+    from services.auth_service import get_auth_service
+    from services.auth0_service import get_auth0_service
+
+    # Close the HTTP clients kept open for OAuth and token validation
+    await get_auth_service().close()
+    await get_auth0_service().close()
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -106,7 +106,7 @@ class AuditMiddleware(BaseHTTPMiddleware):
         # Try to get user from authorization header
         try:
             payload = await get_token_payload(
-                authorization=request.headers.get("authorization")
+                authorization=request.headers.get("authorization"), request=request
             )
             if payload:
                 user_id = (
@@ -167,6 +167,9 @@ class AuditMiddleware(BaseHTTPMiddleware):
                 error_message=str(e),
                 ip_address=ip_address,
                 user_agent=user_agent,
+                correlation_id=correlation_id,
+                request_id=correlation_id,
+                response_time_ms=response_time_ms,
             )
 
             logger.error(
@@ -202,6 +205,9 @@ class AuditMiddleware(BaseHTTPMiddleware):
             status=status,
             ip_address=ip_address,
             user_agent=user_agent,
+            correlation_id=correlation_id,
+            request_id=correlation_id,
+            response_time_ms=response_time_ms,
         )
 
         # Add correlation ID to response headers for tracing
@@ -4,14 +4,17 @@ FastAPI dependencies for protected routes.
 Supports both Auth0 tokens and internal JWT tokens.
 """
 
+from collections import OrderedDict
 from typing import Optional, Union, Dict, Any
 from datetime import datetime, timedelta
-from fastapi import Header, HTTPException, Depends
+from fastapi import Header, HTTPException, Depends, Request
 from services.auth_service import JWTPayload, get_jwt_service
 from services.auth0_service import get_auth0_service
-from config import AUTH0_ENABLED
+from config import AUTH0_ENABLED, JWT_LEEWAY_SECONDS
 import logging
 import asyncio
+import time
+import jwt
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +26,69 @@ UserPayload = Union[JWTPayload, Dict[str, Any]]
 
 
 # Simple in-memory cache for validated tokens to reduce Auth0 API calls
-# Cache key: token hash, value: (payload, expiry time)
-_token_cache: Dict[str, tuple[Dict[str, Any], datetime]] = {}
+# and repeated signature checks
+# Cache key: token hash, value: (payload, expiry time), least recently used first
+_token_cache: "OrderedDict[str, tuple[Dict[str, Any], datetime]]" = OrderedDict()
 _cache_lock = asyncio.Lock()
 
+# Most tokens kept in the cache, and how long before a token's own "exp"
+# it stops being served from the cache (seconds)
+TOKEN_CACHE_MAX_SIZE = 10000
+TOKEN_CACHE_EXP_MARGIN = 10
+
+
+# Token verification (RSA for Auth0) is CPU-bound, so each client gets a
+# token bucket that is only charged when a token misses the cache
+VERIFY_BUCKET_CAPACITY = 20
+VERIFY_BUCKET_REFILL_RATE = 5.0  # tokens per second
+VERIFY_BUCKET_MAX_CLIENTS = 10000
+
+
+class TokenBucket:
+    """Token bucket refilled lazily on each acquire"""
+
+    __slots__ = ("capacity", "last_refill", "refill_rate", "tokens")
+
+    def __init__(
+        self,
+        capacity: int = VERIFY_BUCKET_CAPACITY,
+        refill_rate: float = VERIFY_BUCKET_REFILL_RATE,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        """Take one token if available"""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate
+        )
+        self.last_refill = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+# Verification buckets per client IP, least recently used first
+_verify_buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+
+def _acquire_verify_slot(client_ip: Optional[str]) -> bool:
+    """Charge the client's bucket for one token verification"""
+    if not client_ip:
+        return True
+    bucket = _verify_buckets.get(client_ip)
+    if bucket is None:
+        bucket = _verify_buckets[client_ip] = TokenBucket()
+        while len(_verify_buckets) > VERIFY_BUCKET_MAX_CLIENTS:
+            _verify_buckets.popitem(last=False)
+    else:
+        _verify_buckets.move_to_end(client_ip)
+    return bucket.try_acquire()
+
 
 def _hash_token(token: str) -> str:
     """Simple hash for token caching (not cryptographically secure, just for deduplication)"""
@@ -38,9 +100,11 @@ def _hash_token(token: str) -> str:
 async def _get_cached_token(token_hash: str) -> Optional[Dict[str, Any]]:
     """Get cached token payload if still valid"""
     async with _cache_lock:
-        if token_hash in _token_cache:
-            payload, expiry = _token_cache[token_hash]
+        entry = _token_cache.get(token_hash)
+        if entry:
+            payload, expiry = entry
             if datetime.now() < expiry:
+                _token_cache.move_to_end(token_hash)
                 return payload
             else:
                 del _token_cache[token_hash]
@@ -48,16 +112,24 @@ async def _get_cached_token(token_hash: str) -> Optional[Dict[str, Any]]:
 
 
 async def _cache_token(token_hash: str, payload: Dict[str, Any], ttl_minutes: int = 5):
-    """Cache validated token payload"""
+    """Cache validated token payload, at most until shortly before it expires"""
+    expiry = datetime.now() + timedelta(minutes=ttl_minutes)
+    exp = payload.get("exp")
+    if isinstance(exp, datetime):
+        exp = exp.timestamp()
+    if isinstance(exp, (int, float)):
+        expiry = min(expiry, datetime.fromtimestamp(exp - TOKEN_CACHE_EXP_MARGIN))
+
     async with _cache_lock:
-        _token_cache[token_hash] = (
-            payload,
-            datetime.now() + timedelta(minutes=ttl_minutes),
-        )
+        _token_cache[token_hash] = (payload, expiry)
+        _token_cache.move_to_end(token_hash)
+        while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
 
 
 async def get_token_payload(
     authorization: Optional[str] = Header(None),
+    request: Request = None,
 ) -> Optional[UserPayload]:
     """
     Extract and validate token from Authorization header.
@@ -65,9 +137,14 @@ async def get_token_payload(
 
     Args:
         authorization: Authorization header value
+        request: Incoming request, used to rate limit verification per client
 
     Returns:
         User payload if token is valid, None otherwise
+
+    Raises:
+        HTTPException: 429 if the client has too many uncached tokens verified
+            and this one is not already known to be invalid
     """
     if not authorization:
         return None
@@ -78,11 +155,56 @@ async def get_token_payload(
     token = authorization.split(" ")[1]
     token_hash = _hash_token(token)
 
+    # The audit middleware and the route dependency both ask for the
+    # payload: the outcome of the first call is reused for the request
+    state = request.state if request else None
+    previous = getattr(state, "token_verification", None)
+    if previous and previous[0] == token_hash:
+        if isinstance(previous[1], HTTPException):
+            raise previous[1]
+        return previous[1]
+
     # Check cache first
     cached = await _get_cached_token(token_hash)
     if cached:
         return cached
 
+    # Keyed on the connecting address, never on X-Forwarded-For, which the
+    # client controls. Behind a proxy, list it in uvicorn's
+    # FORWARDED_ALLOW_IPS so the address is the one the proxy saw.
+    client_ip = request.client.host if request and request.client else None
+    if _acquire_verify_slot(client_ip):
+        result = await _verify_token(token, token_hash)
+    elif _rejected_unverified(token):
+        # The token fails anyway: answer 401, not 429
+        result = None
+    else:
+        result = HTTPException(
+            status_code=429,
+            detail="Too many authentication attempts",
+            headers={"Retry-After": "1"},
+        )
+
+    if state is not None:
+        state.token_verification = (token_hash, result)
+    if isinstance(result, HTTPException):
+        raise result
+    return result
+
+
+def _rejected_unverified(token: str) -> bool:
+    """Check whether a token would fail verification, from its unverified claims"""
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        # Not a JWT: only Auth0 accepts those (opaque access tokens)
+        return not AUTH0_ENABLED
+    exp = claims.get("exp")
+    return isinstance(exp, (int, float)) and exp + JWT_LEEWAY_SECONDS < time.time()
+
+
+async def _verify_token(token: str, token_hash: str) -> Optional[UserPayload]:
+    """Verify a token missing from the cache, and cache it if valid"""
     # Try Auth0 validation first if enabled
     if AUTH0_ENABLED:
         auth0_service = get_auth0_service()
@@ -136,9 +258,9 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Check expiration for internal JWT
+    # Check expiration for internal JWT, with the same leeway as decoding
     if isinstance(payload, JWTPayload) and hasattr(payload, "exp"):
-        if payload.exp < datetime.now():
+        if payload.exp + JWT_LEEWAY_SECONDS < time.time():
             raise HTTPException(
                 status_code=401,
                 detail="Token expired",
@@ -148,7 +270,7 @@ async def get_current_user(
     # Check expiration for Auth0 JWT
     if isinstance(payload, dict):
         exp = payload.get("exp")
-        if exp and exp < datetime.now().timestamp():
+        if exp and exp + JWT_LEEWAY_SECONDS < datetime.now().timestamp():
             raise HTTPException(
                 status_code=401,
                 detail="Token expired",
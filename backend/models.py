@@ -79,6 +79,11 @@ class AuditLog(BaseModel):
     post_id: Optional[str] = None
     agent_run_id: Optional[str] = None
 
+    # Request tracing (stored in indexed columns, unlike details)
+    correlation_id: Optional[str] = None
+    request_id: Optional[str] = None
+    response_time_ms: Optional[int] = None
+
 
 class MediaAsset(BaseModel):
     """Track generated media assets (videos, images)"""
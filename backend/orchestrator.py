@@ -138,6 +138,23 @@ class Orchestrator:
 
         return CreatePostResponse(post=post, triggered_agent_runs=triggered_runs)
 
+    async def process_posts_batch(
+        self, texts: List[str], concurrency: int = 4
+    ) -> List[CreatePostResponse]:
+        """
+        Process several new posts concurrently.
+
+        At most `concurrency` posts are processed at a time. Responses are
+        returned in the same order as `texts`.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def process(text: str) -> CreatePostResponse:
+            async with semaphore:
+                return await self.process_post(text)
+
+        return list(await asyncio.gather(*(process(text) for text in texts)))
+
     async def _execute_agent(self, agent_run: AgentRun, trigger_post: Post):
         """Execute an agent run asynchronously with real LLM"""
         # Log agent run start
@@ -12,13 +12,29 @@
 #
 # =============================================================================
 
+import functools
 import importlib
-import inspect
+import logging
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Callable, Any
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 from dataclasses import dataclass, field
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # Plugin Types
@@ -65,16 +81,33 @@ class Plugin:
     metadata: PluginMetadata = None  # type: ignore
     hooks: Dict[PluginHook, Callable] = None  # type: ignore
 
+    # Every subclass, in definition order (populated by __init_subclass__)
+    _registry: ClassVar[List[Type["Plugin"]]] = []
+
+    # (hook type, method name) for each @hook method, collected per class
+    _hook_methods: ClassVar[List[Tuple[PluginHook, str]]] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Plugin._registry.append(cls)
+
+        # Find all methods decorated with @hook
+        hook_methods = []
+        for name in dir(cls):
+            hook_type = getattr(getattr(cls, name), "_hook_type", None)
+            if hook_type is not None:
+                hook_methods.append((hook_type, name))
+        cls._hook_methods = hook_methods
+
     def __init__(self):
         self._hooks: Dict[PluginHook, Callable] = {}
         self._register_hooks()
 
     def _register_hooks(self):
         """Register plugin hooks. Override in subclass."""
-        # Find all methods decorated with @hook
-        for name, method in inspect.getmembers(self, predicate=inspect.method):
-            if hasattr(method, "_hook_type"):
-                self._hooks[method._hook_type] = method
+        # Bind each @hook method once; get_hooks hands out these bound methods
+        for hook_type, name in self._hook_methods:
+            self._hooks[hook_type] = getattr(self, name)
 
     def get_hooks(self) -> Dict[PluginHook, Callable]:
         """Get all registered hooks"""
@@ -104,6 +137,27 @@ def hook(hook_type: PluginHook):
     return decorator
 
 
+# Returned by a safe hook wrapper when the wrapped hook raised
+_HOOK_FAILED = object()
+
+# Shared result for hooks with no listeners (callers only iterate)
+_EMPTY: Tuple[Any, ...] = ()
+
+
+def _safe_hook(hook_type: PluginHook, hook_func: Callable) -> Callable:
+    """Wrap a hook so that errors are reported instead of propagated"""
+
+    @functools.wraps(hook_func)
+    def wrapper(*args, **kwargs):
+        try:
+            return hook_func(*args, **kwargs)
+        except Exception:
+            logger.exception("Error executing hook %s", hook_type)
+            return _HOOK_FAILED
+
+    return wrapper
+
+
 # =============================================================================
 # Plugin Manager
 # =============================================================================
@@ -114,7 +168,8 @@ class PluginManager:
 
     def __init__(self):
         self._plugins: Dict[str, Plugin] = {}
-        self._hooks: Dict[PluginHook, List[Callable]] = {h: [] for h in PluginHook}
+        # Wrapped hooks per type, keyed by id() of the original hook function
+        self._hooks: Dict[PluginHook, Dict[int, Callable]] = defaultdict(dict)
         self._plugin_dirs: List[Path] = []
 
     def add_plugin_directory(self, path: Path):
@@ -122,42 +177,50 @@ class PluginManager:
         if path.is_dir():
             self._plugin_dirs.append(path)
 
+    def iter_plugin_files(self) -> Iterator[Path]:
+        """Yield every *_plugin.py file in the plugin directories"""
+        for plugin_dir in self._plugin_dirs:
+            with os.scandir(plugin_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith("_plugin.py") and entry.is_file():
+                        yield Path(entry.path)
+
     def discover_plugins(self) -> List[PluginMetadata]:
         """Discover all available plugins in plugin directories"""
         discovered = []
-        for plugin_dir in self._plugin_dirs:
-            for py_file in plugin_dir.glob("*_plugin.py"):
-                try:
-                    metadata = self._get_plugin_metadata(py_file)
-                    if metadata:
-                        discovered.append(metadata)
-                except Exception as e:
-                    print(f"Error discovering plugin {py_file}: {e}")
+        for py_file in self.iter_plugin_files():
+            try:
+                metadata = self._get_plugin_metadata(py_file)
+                if metadata:
+                    discovered.append(metadata)
+            except Exception:
+                logger.exception("Error discovering plugin %s", py_file)
         return discovered
 
+    def _exec_plugin_module(self, plugin_path: Path) -> List[Type[Plugin]]:
+        """Execute a plugin file and return the Plugin subclasses it defined"""
+        spec = importlib.util.spec_from_file_location(  # type: ignore
+            plugin_path.stem, plugin_path
+        )
+        if not spec or not spec.loader:
+            return []
+
+        module = importlib.util.module_from_spec(spec)  # type: ignore
+        before = len(Plugin._registry)
+        spec.loader.exec_module(module)
+        return Plugin._registry[before:]
+
     def _get_plugin_metadata(self, plugin_path: Path) -> Optional[PluginMetadata]:
         """Extract metadata from a plugin file"""
         try:
-            # Import the module
-            spec = importlib.util.spec_from_file_location(  # type: ignore
-                plugin_path.stem, plugin_path
-            )
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)  # type: ignore
-                spec.loader.exec_module(module)
-
-                # Find Plugin class
-                for item_name in dir(module):
-                    item = getattr(module, item_name)
-                    if (
-                        inspect.isclass(item)
-                        and issubclass(item, Plugin)
-                        and item is not Plugin
-                    ):
-                        # Instantiate to get metadata
-                        plugin_instance = item()
-                        if plugin_instance.metadata:
-                            return plugin_instance.metadata
+            for item in self._exec_plugin_module(plugin_path):
+                # Metadata is normally a class attribute; only instantiate
+                # plugins that set it up in __init__
+                metadata = getattr(item, "metadata", None)
+                if metadata is None:
+                    metadata = item().metadata
+                if metadata:
+                    return metadata
         except Exception:
             pass
         return None
@@ -165,41 +228,27 @@ class PluginManager:
     def load_plugin(self, plugin_path: Path) -> bool:
         """Load a plugin from a file path"""
         try:
-            spec = importlib.util.spec_from_file_location(  # type: ignore
-                plugin_path.stem, plugin_path
-            )
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)  # type: ignore
-                spec.loader.exec_module(module)
-
-                # Find Plugin class
-                for item_name in dir(module):
-                    item = getattr(module, item_name)
-                    if (
-                        inspect.isclass(item)
-                        and issubclass(item, Plugin)
-                        and item is not Plugin
-                    ):
-                        plugin_instance: Plugin = item()
-                        metadata = plugin_instance.metadata
-
-                        if not metadata or not metadata.enabled:
-                            continue
-
-                        # Register plugin
-                        self._plugins[metadata.name] = plugin_instance
-
-                        # Register hooks
-                        for hook_type, hook_func in plugin_instance.get_hooks().items():
-                            self._hooks[hook_type].append(hook_func)
-
-                        # Call on_enable
-                        plugin_instance.on_enable()
-
-                        print(f"✅ Loaded plugin: {metadata.name} v{metadata.version}")
-                        return True
-        except Exception as e:
-            print(f"❌ Error loading plugin {plugin_path}: {e}")
+            for item in self._exec_plugin_module(plugin_path):
+                plugin_instance: Plugin = item()
+                metadata = plugin_instance.metadata
+
+                if not metadata or not metadata.enabled:
+                    continue
+
+                # Register plugin
+                self._plugins[metadata.name] = plugin_instance
+
+                # Register hooks
+                for hook_type, hook_func in plugin_instance.get_hooks().items():
+                    self.register_hook(hook_type, hook_func)
+
+                # Call on_enable
+                plugin_instance.on_enable()
+
+                logger.info("Loaded plugin: %s v%s", metadata.name, metadata.version)
+                return True
+        except Exception:
+            logger.exception("Error loading plugin %s", plugin_path)
         return False
 
     def unload_plugin(self, plugin_name: str) -> bool:
@@ -210,11 +259,10 @@ class PluginManager:
 
             # Remove hooks
             for hook_type, hook_func in plugin.get_hooks().items():
-                if hook_func in self._hooks[hook_type]:
-                    self._hooks[hook_type].remove(hook_func)
+                self._hooks[hook_type].pop(id(hook_func), None)
 
             del self._plugins[plugin_name]
-            print(f"✅ Unloaded plugin: {plugin_name}")
+            logger.info("Unloaded plugin: %s", plugin_name)
             return True
         return False
 
@@ -229,16 +277,24 @@ class PluginManager:
             return self.unload_plugin(plugin_name)
         return False
 
-    def execute_hook(self, hook_type: PluginHook, *args, **kwargs) -> List[Any]:
+    def register_hook(self, hook_type: PluginHook, hook_func: Callable):
+        """Register a hook function, wrapped so failures are logged"""
+        self._hooks[hook_type][id(hook_func)] = _safe_hook(hook_type, hook_func)
+
+    def execute_hook(self, hook_type: PluginHook, *args, **kwargs) -> Sequence[Any]:
         """Execute all registered hooks for a given hook type"""
-        results = []
-        for hook_func in self._hooks[hook_type]:
-            try:
-                result = hook_func(*args, **kwargs)
-                results.append(result)
-            except Exception as e:
-                print(f"❌ Error executing hook {hook_type}: {e}")
-        return results
+        hooks = self._hooks.get(hook_type)
+        if not hooks:
+            return _EMPTY
+        if len(hooks) == 1:
+            (hook_func,) = hooks.values()
+            result = hook_func(*args, **kwargs)
+            return _EMPTY if result is _HOOK_FAILED else [result]
+        return [
+            result
+            for hook_func in hooks.values()
+            if (result := hook_func(*args, **kwargs)) is not _HOOK_FAILED
+        ]
 
     def get_loaded_plugins(self) -> List[PluginMetadata]:
         """Get metadata for all loaded plugins"""
@@ -279,7 +335,7 @@ class LoggingPlugin(Plugin):
     def log_agent_response(self, agent_name: str, response: str, post_id: str):
         """Log agent responses"""
         log_entry = f"[{agent_name}] Post {post_id}: {response[:100]}..."
-        print(f"📝 {log_entry}")
+        logger.info("%s", log_entry)
         # Could write to file here
         return log_entry
 
@@ -337,9 +393,8 @@ def initialize_plugins():
 
     # Auto-load plugins if enabled
     if PluginConfig.AUTOLOAD_PLUGINS:
-        for plugin_dir in plugin_manager._plugin_dirs:
-            for plugin_file in plugin_dir.glob("*_plugin.py"):
-                plugin_manager.load_plugin(plugin_file)
+        for plugin_file in plugin_manager.iter_plugin_files():
+            plugin_manager.load_plugin(plugin_file)
 
 
 # =============================================================================
@@ -355,12 +410,12 @@ def register_plugin(plugin: Plugin) -> bool:
     plugin_manager._plugins[plugin.metadata.name] = plugin
 
     for hook_type, hook_func in plugin.get_hooks().items():
-        plugin_manager._hooks[hook_type].append(hook_func)
+        plugin_manager.register_hook(hook_type, hook_func)
 
     plugin.on_enable()
     return True
 
 
-def execute_hooks(hook_type: PluginHook, *args, **kwargs) -> List[Any]:
+def execute_hooks(hook_type: PluginHook, *args, **kwargs) -> Sequence[Any]:
     """Execute hooks for a given type"""
     return plugin_manager.execute_hook(hook_type, *args, **kwargs)
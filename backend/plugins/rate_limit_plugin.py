@@ -8,9 +8,9 @@
 # =============================================================================
 
 import time
-from collections import defaultdict
+from collections import deque
 from plugins import Plugin, PluginMetadata, PluginHook, hook
-from typing import Dict, Tuple, Optional
+from typing import Deque, Dict, Tuple, Optional
 
 
 class RateLimitPlugin(Plugin):
@@ -26,10 +26,8 @@ class RateLimitPlugin(Plugin):
 
     def __init__(self):
         super().__init__()
-        # Store request counts: {user_id: {endpoint: [(timestamp, count)]}}
-        self.requests: Dict[str, Dict[str, list]] = defaultdict(
-            lambda: defaultdict(list)
-        )
+        # Request timestamps, oldest first: {(user_id, endpoint): deque}
+        self.requests: Dict[Tuple[str, str], Deque[float]] = {}
 
         # Rate limit configuration (requests per minute)
         self.limits: Dict[str, int] = {
@@ -44,32 +42,40 @@ class RateLimitPlugin(Plugin):
             "default": 10,
         }
 
-        # Agent call tracking
-        self.agent_calls: Dict[str, list] = defaultdict(list)
+        # Agent call timestamps, oldest first: {agent_name: deque}
+        self.agent_calls: Dict[str, Deque[float]] = {}
 
-    def _clean_old_requests(self, requests: list, window: int = 60) -> list:
-        """Remove requests older than the time window"""
-        cutoff = time.time() - window
-        return [req for req in requests if req > cutoff]
+    def _evict(self, timestamps: Deque[float], now: float, window: int = 60) -> None:
+        """Drop timestamps older than the time window"""
+        cutoff = now - window
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
 
     def _check_rate_limit(
         self, user_id: str, endpoint: str, limit: Optional[int] = None
     ) -> Tuple[bool, int]:
         """Check if a request is within rate limits"""
-        limit = limit or self.limits.get(endpoint, self.limits["default"])
+        requests = self.requests
+        limits = self.limits
+        now = time.monotonic()
+
+        limit = limit or limits.get(endpoint, limits["default"])
+
+        key = (user_id, endpoint)
+        timestamps = requests.get(key)
+        if timestamps is None:
+            timestamps = requests[key] = deque()
 
         # Clean old requests
-        self.requests[user_id][endpoint] = self._clean_old_requests(
-            self.requests[user_id][endpoint]
-        )
+        self._evict(timestamps, now)
 
         # Check limit
-        current_count = len(self.requests[user_id][endpoint])
+        current_count = len(timestamps)
         if current_count >= limit:
             return False, 0  # Rate limited
 
         # Add this request
-        self.requests[user_id][endpoint].append(time.time())
+        timestamps.append(now)
         return True, limit - current_count - 1  # OK, remaining count
 
     @hook(PluginHook.ON_API_REQUEST)
@@ -84,10 +90,11 @@ class RateLimitPlugin(Plugin):
         allowed, remaining = self._check_rate_limit(user_id, endpoint)
 
         if not allowed:
+            limits = self.limits
             return {
                 "allowed": False,
                 "error": "Rate limit exceeded",
-                "limit": self.limits.get(endpoint, self.limits["default"]),
+                "limit": limits.get(endpoint, limits["default"]),
             }
 
         return {"allowed": True, "remaining": remaining}
@@ -97,17 +104,23 @@ class RateLimitPlugin(Plugin):
         self, agent_name: str, response: str, post_id: str
     ) -> Dict[str, any]:
         """Track agent calls for rate limiting"""
-        limit = self.agent_limits.get(agent_name, self.agent_limits["default"])
+        agent_limits = self.agent_limits
+        agent_calls = self.agent_calls
+        now = time.monotonic()
+
+        limit = agent_limits.get(agent_name, agent_limits["default"])
+
+        calls = agent_calls.get(agent_name)
+        if calls is None:
+            calls = agent_calls[agent_name] = deque()
 
         # Clean old calls
-        self.agent_calls[agent_name] = self._clean_old_requests(
-            self.agent_calls[agent_name]
-        )
+        self._evict(calls, now)
 
         # Check limit (this is post-response, so just tracking)
-        self.agent_calls[agent_name].append(time.time())
+        calls.append(now)
 
-        current = len(self.agent_calls[agent_name])
+        current = len(calls)
 
         return {
             "agent": agent_name,
@@ -119,20 +132,26 @@ class RateLimitPlugin(Plugin):
     def get_usage_stats(self, user_id: str) -> Dict[str, any]:
         """Get rate limit usage stats for a user"""
         stats = {}
-        for endpoint, requests in self.requests[user_id].items():
-            limit = self.limits.get(endpoint, self.limits["default"])
+        limits = self.limits
+        evict = self._evict
+        now = time.monotonic()
+        for (uid, endpoint), timestamps in self.requests.items():
+            if uid != user_id:
+                continue
+            limit = limits.get(endpoint, limits["default"])
             # Clean old first
-            requests = self._clean_old_requests(requests)
+            evict(timestamps, now)
             stats[endpoint] = {
-                "used": len(requests),
+                "used": len(timestamps),
                 "limit": limit,
-                "remaining": max(0, limit - len(requests)),
+                "remaining": max(0, limit - len(timestamps)),
             }
         return stats
 
     def get_agent_stats(self, agent_name: str) -> Dict[str, any]:
         """Get rate limit stats for an agent"""
-        calls = self._clean_old_requests(self.agent_calls[agent_name])
+        calls = self.agent_calls.get(agent_name, deque())
+        self._evict(calls, time.monotonic())
         limit = self.agent_limits.get(agent_name, self.agent_limits["default"])
         return {
             "agent": agent_name,
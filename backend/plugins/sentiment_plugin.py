@@ -22,13 +22,9 @@ class SentimentPlugin(Plugin):
         enabled=True,
     )
 
-    def __init__(self):
-        super().__init__()
-        self.sentiment_scores: Dict[str, float] = {}
-
-    def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
-        """Simple sentiment analysis (can be enhanced with NLP library)"""
-        positive_words = [
+    # Word lists used by the scorer (frozensets for O(1) membership)
+    _POSITIVE = frozenset(
+        {
             "good",
             "great",
             "awesome",
@@ -40,8 +36,10 @@ class SentimentPlugin(Plugin):
             "best",
             "fantastic",
             "thanks",
-        ]
-        negative_words = [
+        }
+    )
+    _NEGATIVE = frozenset(
+        {
             "bad",
             "terrible",
             "awful",
@@ -54,13 +52,25 @@ class SentimentPlugin(Plugin):
             "disappointed",
             "error",
             "fail",
-        ]
+        }
+    )
 
-        text_lower = text.lower()
-        words = text_lower.split()
+    def __init__(self):
+        super().__init__()
+        self.sentiment_scores: Dict[str, float] = {}
 
-        positive_count = sum(1 for word in words if word in positive_words)
-        negative_count = sum(1 for word in words if word in negative_words)
+    def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        """Simple sentiment analysis (can be enhanced with NLP library)"""
+        pos_set = SentimentPlugin._POSITIVE
+        neg_set = SentimentPlugin._NEGATIVE
+
+        # Count hits for both word lists in a single pass over the text
+        positive_count = negative_count = 0
+        for word in text.lower().split():
+            if word in pos_set:
+                positive_count += 1
+            elif word in neg_set:
+                negative_count += 1
 
         total = positive_count + negative_count
         if total == 0:
@@ -7,10 +7,37 @@
 #
 # =============================================================================
 
+import logging
 import os
+from datetime import datetime, timezone
 import httpx
 from plugins import Plugin, PluginMetadata, PluginHook, hook
-from typing import Dict, Any
+from typing import Callable, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Use orjson for payload encoding when installed, stdlib json otherwise
+try:
+    import orjson
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data)
+
+except ImportError:
+    import json
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode()
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Webhook URL backing each notification hook
+_HOOK_WEBHOOKS: Dict[PluginHook, str] = {
+    PluginHook.ON_POST_CREATE: "post_create",
+    PluginHook.ON_AGENT_RESPONSE: "agent_response",
+    PluginHook.ON_THREAD_COMPLETE: "thread_complete",
+}
 
 
 class WebhookPlugin(Plugin):
@@ -30,20 +57,31 @@ class WebhookPlugin(Plugin):
         self.webhooks: Dict[str, str] = {
             "post_create": os.getenv("WEBHOOK_POST_CREATE", ""),
             "agent_response": os.getenv("WEBHOOK_AGENT_RESPONSE", ""),
+            "thread_complete": os.getenv("WEBHOOK_THREAD_COMPLETE", ""),
             "error": os.getenv("WEBHOOK_ERROR", ""),
         }
         self.client = httpx.AsyncClient(timeout=10.0)
 
+    def get_hooks(self) -> Dict[PluginHook, Callable]:
+        """Get hooks, leaving out notifications with no webhook configured"""
+        hooks = dict(super().get_hooks())
+        for hook_type, webhook in _HOOK_WEBHOOKS.items():
+            if not self.webhooks.get(webhook):
+                hooks.pop(hook_type, None)
+        return hooks
+
     async def _send_webhook(self, url: str, data: Dict[str, Any]) -> bool:
         """Send a webhook notification"""
         if not url:
             return False
 
         try:
-            response = await self.client.post(url, json=data)
+            response = await self.client.post(
+                url, content=_dumps(data), headers=_JSON_HEADERS
+            )
             return response.status_code in (200, 204)
-        except Exception as e:
-            print(f"Webhook error: {e}")
+        except Exception:
+            logger.exception("Webhook error sending to %s", url)
             return False
 
     @hook(PluginHook.ON_POST_CREATE)
@@ -106,10 +144,12 @@ class WebhookPlugin(Plugin):
         return {"webhook_sent": success, "url": webhook_url}
 
     def _get_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-
-        return datetime.utcnow().isoformat() + "Z"
+        """Get current UTC timestamp in ISO 8601 format"""
+        return (
+            datetime.now(timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z")
+        )
 
     def on_disable(self):
         """Clean up resources"""
@@ -6,6 +6,9 @@
 -- Enable UUID extension if not already enabled
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Trigram indexes, for substring search over audit log details
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- =============================================================================
 -- AUDIT LOGS TABLE
 -- Stores all system events with full context and traceability
@@ -130,14 +133,34 @@ CREATE TABLE IF NOT EXISTS conversation_audits (
 -- =============================================================================
 
 -- Audit logs indexes
-CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp DESC);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_event_type ON audit_logs(event_type);
+-- Queries are ordered by timestamp DESC, so each filter column is paired
+-- with the timestamp: the index serves both the filter and the ordering.
+-- The id breaks timestamp ties, which keeps cursor (keyset) pages stable.
+--   no filter / date range  -> idx_audit_logs_timestamp_id
+--   event_type              -> idx_audit_logs_event_type_timestamp
+--   user_id                 -> idx_audit_logs_user_timestamp
+--   thread_id               -> idx_audit_logs_thread_timestamp
+--   resource_type + _id     -> idx_audit_logs_resource
+--   status                  -> idx_audit_logs_status
+--   search (details ILIKE)  -> idx_audit_logs_details_trgm
+CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp_id ON audit_logs(timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_event_type_timestamp ON audit_logs(event_type, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_status ON audit_logs(status);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_user_id ON audit_logs(user_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_timestamp ON audit_logs(user_id, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_resource ON audit_logs(resource_type, resource_id);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_thread_id ON audit_logs(thread_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_thread_timestamp ON audit_logs(thread_id, timestamp DESC);
+
+-- Single-column indexes superseded by the composite ones above
+DROP INDEX IF EXISTS idx_audit_logs_timestamp;
+DROP INDEX IF EXISTS idx_audit_logs_event_type;
+DROP INDEX IF EXISTS idx_audit_logs_user_id;
+DROP INDEX IF EXISTS idx_audit_logs_thread_id;
 CREATE INDEX IF NOT EXISTS idx_audit_logs_correlation_id ON audit_logs(correlation_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_request_id ON audit_logs(request_id);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_details_gin ON audit_logs USING GIN (details);
+-- Serves query_audit_logs' details::text ILIKE '%term%' for terms of three
+-- or more characters; shorter terms still scan the table
+CREATE INDEX IF NOT EXISTS idx_audit_logs_details_trgm ON audit_logs USING GIN ((details::text) gin_trgm_ops);
 
 -- Media assets indexes
 CREATE INDEX IF NOT EXISTS idx_media_assets_created_at ON media_assets(created_at DESC);
@@ -220,7 +243,8 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- Trigger to auto-update updated_at
+-- Trigger to auto-update updated_at (recreated so the script can be re-run)
+DROP TRIGGER IF EXISTS update_conversation_audits_updated_at ON conversation_audits;
 CREATE TRIGGER update_conversation_audits_updated_at
     BEFORE UPDATE ON conversation_audits
     FOR EACH ROW
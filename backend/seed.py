@@ -8,10 +8,35 @@ import asyncio
 import sys
 import os
 
+# Faster drop-in event loop, installed with uvicorn[standard]
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from orchestrator import orchestrator
+from services.audit_service import audit_service
+from services.database_service import database_service
+
+# Maximum number of seed posts processed at the same time
+SEED_CONCURRENCY = 4
+
+
+async def copy_audit_logs_to_database():
+    """Write the audit logs recorded while seeding to PostgreSQL in one COPY"""
+    await database_service.initialize()
+    if not database_service.is_enabled():
+        return
+
+    try:
+        logs = audit_service.get_logs_sync(page_size=10000)["logs"]
+        count = await database_service.copy_audit_logs(logs)
+        print(f"🗄️  Copied {count} audit logs to the database")
+    finally:
+        await database_service.close()
 
 
 async def create_seed_data():
@@ -50,8 +75,18 @@ async def create_seed_data():
     print(f"🌱 Creating {len(seed_posts)} seed posts...")
     for i, post_data in enumerate(seed_posts, 1):
         print(f"  [{i}/{len(seed_posts)}] {post_data['text'][:50]}...")
-        await orchestrator.process_post(post_data["text"])
-        await asyncio.sleep(0.3)
+
+    await orchestrator.process_posts_batch(
+        [post_data["text"] for post_data in seed_posts],
+        concurrency=SEED_CONCURRENCY,
+    )
+
+    # Wait for the agent runs and commands the posts triggered in the background
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    await copy_audit_logs_to_database()
 
     print("✅ Seed data created successfully!")
 
@@ -61,4 +96,5 @@ if __name__ == "__main__":
     print("🌱 Agent Twitter - Seed Data Generator")
     print("=" * 50)
     print()
-    asyncio.run(create_seed_data())
+    run_loop = uvloop.run if uvloop else asyncio.run
+    run_loop(create_seed_data())
@@ -1,18 +1,34 @@
 """
 External API services for Agent Twitter.
 Includes LLM, search, scraping, media generation, and email services.
+
+Service modules are imported lazily on first attribute access (PEP 562),
+so importing one service does not pull in the dependencies of the others.
+
+The scraping, media and email singletons share their submodule's name.
+Importing a submodule sets the package attribute of that name to the
+module, which would then hide the singleton from __getattr__, so those
+three are bound eagerly.
 """
 
-from .llm_service import LLMService, generate_agent_response
-from .search_service import SearchService, search_web
-from .scraping_service import (
-    ScrapingService,
-    scrape_url,
-    scrape_content,
-    scraping_service,
-)
-from .media_service import MediaService, media_service
-from .email_service import EmailService, email_service
+import importlib
+
+from .scraping_service import scraping_service
+from .media_service import media_service
+from .email_service import email_service
+
+# Public name -> submodule that defines it
+_LAZY = {
+    "LLMService": "llm_service",
+    "generate_agent_response": "llm_service",
+    "SearchService": "search_service",
+    "search_web": "search_service",
+    "ScrapingService": "scraping_service",
+    "scrape_url": "scraping_service",
+    "scrape_content": "scraping_service",
+    "MediaService": "media_service",
+    "EmailService": "email_service",
+}
 
 __all__ = [
     "LLMService",
@@ -28,3 +44,19 @@ __all__ = [
     "EmailService",
     "email_service",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
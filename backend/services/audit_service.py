@@ -5,14 +5,150 @@ Tracks all significant events in the system for compliance and debugging.
 Integrates with PostgreSQL for permanent storage when available.
 """
 
-import uuid
+import asyncio
+import csv
+import itertools
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import os
+import secrets
+from collections import Counter, OrderedDict, defaultdict
+from typing import (
+    Optional,
+    Dict,
+    Any,
+    AsyncIterator,
+    Iterator,
+    List,
+    Sequence,
+    Set,
+    Tuple,
+)
 from datetime import datetime
 from models import AuditLog, AuditEventType, MediaAsset, ConversationAudit
 
 logger = logging.getLogger(__name__)
 
+# Use orjson for JSON exports when installed, stdlib json otherwise. Both
+# write datetimes in ISO 8601 and fall back to str() for unknown types.
+try:
+    import orjson
+
+    def _dumps(data: Dict[str, Any]) -> str:
+        return orjson.dumps(data, default=str).decode()
+
+except ImportError:
+
+    def _json_default(value: Any) -> str:
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+
+    def _dumps(data: Dict[str, Any]) -> str:
+        return json.dumps(data, separators=(",", ":"), default=_json_default)
+
+
+# Background database writer: logs per batch, seconds to wait for a batch
+# to fill up, and the maximum number of items waiting to be written
+AUDIT_BATCH_SIZE = 200
+AUDIT_FLUSH_INTERVAL = 0.1
+AUDIT_QUEUE_SIZE = 10000
+
+# Most recent logs kept in memory; older ones are only in the database
+AUDIT_CACHE_MAX_LOGS = 50000
+
+# Longest post text / media prompt copied into an audit log's details
+AUDIT_DETAIL_TEXT_LIMIT = 200
+
+
+# Columns of the default CSV export (AuditLog field names)
+EXPORT_CSV_FIELDS = (
+    "timestamp",
+    "event_type",
+    "user_id",
+    "resource_type",
+    "resource_id",
+    "status",
+    "thread_id",
+)
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for streaming CSV."""
+
+    def write(self, line: str) -> str:
+        return line
+
+
+def _csv_value(log: AuditLog, field: str) -> Any:
+    """Return an AuditLog field in its CSV export form."""
+    value = getattr(log, field)
+    if field == "event_type":
+        return value.value
+    if field == "details":
+        return json.dumps(value)
+    return value
+
+
+class _ExportWriter:
+    """Serializes audit logs one record at a time in an export format."""
+
+    def __init__(self, format: str, fields: Sequence[str]):
+        self.format = format
+        self.fields = fields
+        self._csv = csv.writer(_Echo())
+        self._count = 0
+
+    def header(self) -> str:
+        if self.format == "csv":
+            return self._csv.writerow(self.fields)
+        return "["
+
+    def record(self, log: AuditLog) -> str:
+        self._count += 1
+        if self.format == "json":
+            return ("," if self._count > 1 else "") + _dumps(log.dict())
+        if self.format == "csv":
+            return self._csv.writerow([_csv_value(log, f) for f in self.fields])
+        return (", " if self._count > 1 else "") + repr(log.dict())
+
+    def footer(self) -> str:
+        return "" if self.format == "csv" else "]"
+
+
+def _naive_local(value: datetime) -> datetime:
+    """Convert an aware datetime to naive local time, like datetime.now()."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, without copying text that already fits."""
+    return text if len(text) <= limit else text[:limit]
+
+
+def _reset_id_sequence():
+    """Pick a new random ID prefix and restart the counter (also after fork)."""
+    global _id_prefix, _id_counter
+    prefix = secrets.token_hex(8)
+    _id_prefix = f"{prefix[:8]}-{prefix[8:12]}-{prefix[12:]}-"
+    _id_counter = itertools.count()
+
+
+_reset_id_sequence()
+if hasattr(os, "register_at_fork"):  # Not available on Windows
+    os.register_at_fork(after_in_child=_reset_id_sequence)
+
+
+def _new_id() -> str:
+    """
+    Return a new record ID in UUID text form (the database columns are UUID).
+
+    A random 64-bit per-process prefix plus a 64-bit counter; much cheaper
+    than str(uuid.uuid4()), which reads os.urandom for every ID.
+    """
+    n = next(_id_counter)
+    return f"{_id_prefix}{n >> 48:04x}-{n & 0xFFFFFFFFFFFF:012x}"
+
 
 class AuditService:
     """
@@ -21,28 +157,160 @@ class AuditService:
     Features:
     - In-memory caching for fast access
     - PostgreSQL backend for permanent storage
-    - Automatic sync between cache and database
+    - Automatic sync between cache and database (batched in the background)
     - Export capabilities for compliance
     """
 
     def __init__(self):
         # In-memory storage for audit logs (cache)
-        self._logs: Dict[str, AuditLog] = {}
+        # Kept in insertion order, which is also timestamp order, and capped
+        # at AUDIT_CACHE_MAX_LOGS by evicting the oldest entries
+        self._logs: Dict[str, AuditLog] = OrderedDict()
+
+        # Secondary indexes over self._logs: field value -> log IDs, as
+        # insertion-ordered dicts so they keep the timestamp order too
+        self._by_user: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._by_thread: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._by_event_type: Dict[AuditEventType, Dict[str, None]] = defaultdict(dict)
+        self._by_resource: Dict[Tuple[str, str], Dict[str, None]] = defaultdict(dict)
+
+        # Lowercased searchable text per log ID, filled in by _search_text
+        self._search_texts: Dict[str, str] = {}
         self._media_assets: Dict[str, MediaAsset] = {}
+        # Media assets per asset type, kept up to date for get_stats
+        self._media_type_counts: Counter = Counter()
         self._conversation_audits: Dict[str, ConversationAudit] = {}
+        # (field, value) pairs already in each conversation audit's lists,
+        # so update_conversation_audit can skip duplicates without a scan
+        self._conversation_members: Dict[str, Set[Tuple[str, str]]] = {}
         self._database_service = None
 
+        # Logs and media assets waiting for the background database writer,
+        # and how many were dropped because the queue was full
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._dropped_writes = 0
+        # Event loop the writer task runs on
+        self._writer_loop_ref: Optional[asyncio.AbstractEventLoop] = None
+
     def set_database_service(self, db_service):
         """Set the database service for persistent storage."""
         self._database_service = db_service
 
-    async def _store_to_database(self, log: AuditLog):
-        """Async store log to database if available."""
-        if self._database_service:
+    def _index_entries(self, log: AuditLog):
+        """Yield (index, key) for every secondary index entry of a log."""
+        if log.user_id:
+            yield self._by_user, log.user_id
+        if log.thread_id:
+            yield self._by_thread, log.thread_id
+        yield self._by_event_type, log.event_type
+        if log.resource_type and log.resource_id:
+            yield self._by_resource, (log.resource_type, log.resource_id)
+
+    def _add_log(self, log: AuditLog):
+        """Add a log to the cache and its secondary indexes."""
+        self._logs[log.id] = log
+        for index, key in self._index_entries(log):
+            index[key][log.id] = None
+
+        if len(self._logs) > AUDIT_CACHE_MAX_LOGS:
+            oldest_id = next(iter(self._logs))
+            self._remove_log(oldest_id)
+            logger.debug("Evicted audit log %s from the in-memory cache", oldest_id)
+
+    def _remove_log(self, log_id: str):
+        """Remove a log from the cache and its secondary indexes."""
+        log = self._logs.pop(log_id)
+        self._search_texts.pop(log_id, None)
+        for index, key in self._index_entries(log):
+            ids = index[key]
+            del ids[log_id]
+            if not ids:
+                del index[key]
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        """
+        Start the background database writer on first use.
+
+        The writer is restarted if the running event loop has changed, since
+        a task on a finished loop never runs again. Raises RuntimeError when
+        called outside a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._writer_loop_ref or self._writer_task.done():
+            if self._queue is not None and self._queue.qsize():
+                logger.warning(
+                    "Audit writer restarted, %d queued items were not written",
+                    self._queue.qsize(),
+                )
+            self._writer_loop_ref = loop
+            self._queue = asyncio.Queue(maxsize=AUDIT_QUEUE_SIZE)
+            self._writer_task = loop.create_task(self._writer_loop(self._queue))
+        return self._queue
+
+    def _enqueue(self, item) -> None:
+        """
+        Queue a log or media asset for the background writer without blocking.
+
+        Items are dropped (and counted) when the queue is full. Callers on a
+        thread without an event loop hand the item over to the loop the
+        writer (and the database pool) runs on; if there is none, the
+        database write is skipped.
+        """
+        try:
+            queue = self._ensure_writer()
+        except RuntimeError:
+            loop = self._writer_loop_ref
+            if loop is not None and not loop.is_closed():
+                try:
+                    loop.call_soon_threadsafe(self._enqueue, item)
+                except RuntimeError:
+                    pass  # The loop closed in the meantime
+            return
+
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._dropped_writes += 1
+            logger.warning(
+                "Audit write queue is full, dropped %s %s (%d dropped so far)",
+                type(item).__name__,
+                item.id,
+                self._dropped_writes,
+            )
+
+    async def _writer_loop(self, queue: asyncio.Queue):
+        """Write queued logs and media assets to the database in batches."""
+        while True:
+            batch = [await queue.get()]
+            if queue.qsize() < AUDIT_BATCH_SIZE - 1:
+                # Give the rest of a burst of events a moment to join the batch
+                await asyncio.sleep(AUDIT_FLUSH_INTERVAL)
+            while len(batch) < AUDIT_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            logs = [item for item in batch if isinstance(item, AuditLog)]
+            assets = [item for item in batch if isinstance(item, MediaAsset)]
             try:
-                await self._database_service.store_audit_log(log)
+                if logs:
+                    await self._database_service.store_audit_logs_bulk(logs)
+                if assets:
+                    await self._database_service.store_media_assets_bulk(assets)
             except Exception as e:
-                logger.warning(f"Failed to store audit log to database: {e}")
+                logger.warning(
+                    f"Failed to store {len(batch)} audit records to database: {e}"
+                )
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush(self):
+        """Wait until all queued items have been written to the database."""
+        if (
+            self._writer_loop_ref is asyncio.get_running_loop()
+            and not self._writer_task.done()
+        ):
+            await self._queue.join()
 
     # ========================================================================
     # LOGGING METHODS
@@ -63,6 +331,9 @@ class AuditService:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
         session_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        response_time_ms: Optional[int] = None,
     ) -> AuditLog:
         """
         Log an audit event.
@@ -81,11 +352,14 @@ class AuditService:
             ip_address: Client IP address
             user_agent: Client user agent
             session_id: Session identifier
+            correlation_id: Correlation ID of the request being traced
+            request_id: Request identifier
+            response_time_ms: Time taken to handle the request
 
         Returns:
             The created AuditLog entry
         """
-        log_id = str(uuid.uuid4())
+        log_id = _new_id()
         log = AuditLog(
             id=log_id,
             timestamp=datetime.now(),
@@ -102,19 +376,30 @@ class AuditService:
             thread_id=thread_id,
             post_id=post_id,
             agent_run_id=agent_run_id,
+            correlation_id=correlation_id,
+            request_id=request_id,
+            response_time_ms=response_time_ms,
         )
 
-        self._logs[log_id] = log
+        self._add_log(log)
 
-        # Store to database asynchronously
-        await self._store_to_database(log)
+        # Hand off to the background writer, which stores logs in batches;
+        # never waits, so a slow database cannot stall the caller
+        if self._database_service:
+            self._enqueue(log)
 
         # Log to standard logger for immediate visibility
         log_level = logging.ERROR if status == "failed" else logging.INFO
-        logger.log(
-            log_level,
-            f"[{event_type.value}] user={user_id} resource={resource_type}:{resource_id} status={status}",
-        )
+        if logger.isEnabledFor(log_level):
+            logger.log(
+                log_level,
+                "[%s] user=%s resource=%s:%s status=%s",
+                event_type.value,
+                user_id,
+                resource_type,
+                resource_id,
+                status,
+            )
 
         return log
 
@@ -133,19 +418,22 @@ class AuditService:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
         session_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        correlation_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        response_time_ms: Optional[int] = None,
     ) -> AuditLog:
         """
         Synchronous version of log_event for use in non-async contexts.
 
         Returns immediately without waiting for database storage.
         Database write happens in the background if available.
+        timestamp defaults to now; pass it to reuse a time already read.
         """
-        import asyncio
-
-        log_id = str(uuid.uuid4())
+        log_id = _new_id()
         log = AuditLog(
             id=log_id,
-            timestamp=datetime.now(),
+            timestamp=timestamp or datetime.now(),
             event_type=event_type,
             user_id=user_id,
             session_id=session_id,
@@ -159,25 +447,29 @@ class AuditService:
             thread_id=thread_id,
             post_id=post_id,
             agent_run_id=agent_run_id,
+            correlation_id=correlation_id,
+            request_id=request_id,
+            response_time_ms=response_time_ms,
         )
 
-        self._logs[log_id] = log
+        self._add_log(log)
 
-        # Schedule database write without blocking
+        # Queue the database write without blocking
         if self._database_service:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(self._store_to_database(log))
-            except RuntimeError:
-                pass  # No event loop running, skip database write
+            self._enqueue(log)
 
         # Log to standard logger
         log_level = logging.ERROR if status == "failed" else logging.INFO
-        logger.log(
-            log_level,
-            f"[{event_type.value}] user={user_id} resource={resource_type}:{resource_id} status={status}",
-        )
+        if logger.isEnabledFor(log_level):
+            logger.log(
+                log_level,
+                "[%s] user=%s resource=%s:%s status=%s",
+                event_type.value,
+                user_id,
+                resource_type,
+                resource_id,
+                status,
+            )
 
         return log
 
@@ -196,7 +488,7 @@ class AuditService:
             resource_type="post",
             resource_id=post_id,
             details={
-                "text": text[:200],  # Truncate long text
+                "text": _truncate(text, AUDIT_DETAIL_TEXT_LIMIT),
                 "parent_id": parent_id,
             },
             thread_id=thread_id,
@@ -282,11 +574,12 @@ class AuditService:
         Returns:
             Tuple of (MediaAsset, AuditLog)
         """
-        # Create media asset record
-        asset_id = str(uuid.uuid4())
+        # Create media asset record; the asset and its log share one timestamp
+        now = datetime.now()
+        asset_id = _new_id()
         asset = MediaAsset(
             id=asset_id,
-            created_at=datetime.now(),
+            created_at=now,
             asset_type=asset_type,  # type: ignore
             url=url,
             prompt=prompt,
@@ -298,6 +591,7 @@ class AuditService:
             status=status,
         )
         self._media_assets[asset_id] = asset
+        self._media_type_counts[asset_type] += 1
 
         # Log the event
         event_type = (
@@ -308,14 +602,7 @@ class AuditService:
 
         # Store to database if available
         if self._database_service:
-            try:
-                import asyncio
-
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(self._database_service.store_media_asset(asset))
-            except RuntimeError:
-                pass  # No event loop
+            self._enqueue(asset)
 
         log = self.log_event_sync(
             event_type=event_type,
@@ -325,7 +612,7 @@ class AuditService:
             details={
                 "asset_type": asset_type,
                 "url": url,
-                "prompt": prompt[:200],
+                "prompt": _truncate(prompt, AUDIT_DETAIL_TEXT_LIMIT),
                 "service": service,
                 "duration_seconds": duration_seconds,
             },
@@ -333,6 +620,7 @@ class AuditService:
             error_message=error_message,
             thread_id=thread_id,
             post_id=post_id,
+            timestamp=now,
         )
 
         return asset, log
@@ -409,79 +697,63 @@ class AuditService:
         search_query: Optional[str] = None,
         page: int = 1,
         page_size: int = 100,
+        after_timestamp: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        with_total: bool = True,
     ) -> Dict[str, Any]:
         """
         Query audit logs with filters and pagination.
 
+        Passing the previous page's next_cursor as after_timestamp and
+        after_id returns the logs after it, instead of a numbered page.
+        with_total=False lets the database skip counting the matches
+        (total_count is then None); the cache counts them either way.
+
         Returns:
             Dict with logs list and pagination info
         """
-        # If database is available, query from database
-        if self._database_service:
-            try:
-                return await self._database_service.query_audit_logs(
-                    event_type=event_type.value if event_type else None,
-                    user_id=user_id,
-                    resource_type=resource_type,
-                    resource_id=resource_id,
-                    thread_id=thread_id,
-                    status=status,
-                    start_date=start_date,
-                    end_date=end_date,
-                    search_query=search_query,
-                    page=page,
-                    page_size=page_size,
-                )
-            except Exception as e:
-                logger.warning(f"Database query failed, falling back to memory: {e}")
-
-        # Fallback to in-memory query
-        filtered = list(self._logs.values())
-
-        # Apply filters
-        if event_type:
-            filtered = [log for log in filtered if log.event_type == event_type]
-        if user_id:
-            filtered = [log for log in filtered if log.user_id == user_id]
-        if resource_type:
-            filtered = [log for log in filtered if log.resource_type == resource_type]
-        if resource_id:
-            filtered = [log for log in filtered if log.resource_id == resource_id]
-        if thread_id:
-            filtered = [log for log in filtered if log.thread_id == thread_id]
-        if status:
-            filtered = [log for log in filtered if log.status == status]
-        if start_date:
-            filtered = [log for log in filtered if log.timestamp >= start_date]
-        if end_date:
-            filtered = [log for log in filtered if log.timestamp <= end_date]
-        if search_query:
-            filtered = [
-                log
-                for log in filtered
-                if search_query.lower() in str(log.details).lower()
-                or (
-                    log.error_message
-                    and search_query.lower() in log.error_message.lower()
-                )
-            ]
-
-        # Sort by timestamp descending
-        filtered.sort(key=lambda x: x.timestamp, reverse=True)
-
-        # Pagination
-        total_count = len(filtered)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_logs = filtered[start_idx:end_idx]
+        # A healthy database holds every log and filters with its indexes
+        if self._database_service and await self._database_service.health_check():
+            return await self._database_service.query_audit_logs(
+                event_type=event_type.value if event_type else None,
+                user_id=user_id,
+                resource_type=resource_type,
+                resource_id=resource_id,
+                thread_id=thread_id,
+                status=status,
+                start_date=start_date,
+                end_date=end_date,
+                search_query=search_query,
+                page=page,
+                page_size=page_size,
+                after_timestamp=after_timestamp,
+                after_id=after_id,
+                correlation_id=correlation_id,
+                request_id=request_id,
+                with_total=with_total,
+            )
 
-        return {
-            "logs": paginated_logs,
-            "total_count": total_count,
-            "page": page,
-            "page_size": page_size,
-            "has_more": end_idx < total_count,
-        }
+        # Otherwise query the in-memory cache
+        filtered = self._filter_logs(
+            event_type=event_type,
+            user_id=user_id,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            thread_id=thread_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            search_query=search_query,
+            correlation_id=correlation_id,
+            request_id=request_id,
+        )
+        if after_timestamp is not None and after_id is not None:
+            return self._paginate_after(
+                filtered, (after_timestamp, after_id), page, page_size
+            )
+        return self._paginate(filtered, page, page_size)
 
     def get_logs_sync(
         self,
@@ -500,42 +772,157 @@ class AuditService:
         Synchronous version of get_logs for backwards compatibility.
         Only queries in-memory cache.
         """
-        # Start with all logs
-        filtered = list(self._logs.values())
+        filtered = self._filter_logs(
+            event_type=event_type,
+            user_id=user_id,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            thread_id=thread_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return self._paginate(filtered, page, page_size)
+
+    def _filter_logs(
+        self,
+        event_type: Optional[AuditEventType] = None,
+        user_id: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search_query: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> List[AuditLog]:
+        """
+        Return the cached logs matching all given filters, in one pass.
 
-        # Apply filters
-        if event_type:
-            filtered = [log for log in filtered if log.event_type == event_type]
+        The result is in timestamp order, oldest first.
+        """
+        query = search_query.lower() if search_query else None
+
+        # Narrow the scan to the intersection of the matching index sets
+        id_sets = []
         if user_id:
-            filtered = [log for log in filtered if log.user_id == user_id]
-        if resource_type:
-            filtered = [log for log in filtered if log.resource_type == resource_type]
-        if resource_id:
-            filtered = [log for log in filtered if log.resource_id == resource_id]
+            id_sets.append(self._by_user.get(user_id, ()))
         if thread_id:
-            filtered = [log for log in filtered if log.thread_id == thread_id]
-        if status:
-            filtered = [log for log in filtered if log.status == status]
-        if start_date:
-            filtered = [log for log in filtered if log.timestamp >= start_date]
-        if end_date:
-            filtered = [log for log in filtered if log.timestamp <= end_date]
-
-        # Sort by timestamp descending
-        filtered.sort(key=lambda x: x.timestamp, reverse=True)
-
-        # Pagination
-        total_count = len(filtered)
+            id_sets.append(self._by_thread.get(thread_id, ()))
+        if event_type:
+            id_sets.append(self._by_event_type.get(event_type, ()))
+        if resource_type and resource_id:
+            id_sets.append(self._by_resource.get((resource_type, resource_id), ()))
+
+        if id_sets:
+            # Walk the smallest set in order, probing the others
+            id_sets.sort(key=len)
+            smallest, others = id_sets[0], id_sets[1:]
+            candidates = [
+                self._logs[log_id]
+                for log_id in smallest
+                if all(log_id in ids for ids in others)
+            ]
+        elif not (
+            status
+            or start_date
+            or end_date
+            or query
+            or resource_type
+            or resource_id
+            or correlation_id
+            or request_id
+        ):
+            return list(self._logs.values())
+        else:
+            candidates = self._logs.values()
+
+        # Unset (falsy) filters short-circuit to True for every log
+        return [
+            log
+            for log in candidates
+            if (not event_type or log.event_type == event_type)
+            and (not user_id or log.user_id == user_id)
+            and (not resource_type or log.resource_type == resource_type)
+            and (not resource_id or log.resource_id == resource_id)
+            and (not thread_id or log.thread_id == thread_id)
+            and (not status or log.status == status)
+            and (not start_date or log.timestamp >= start_date)
+            and (not end_date or log.timestamp <= end_date)
+            and (not correlation_id or log.correlation_id == correlation_id)
+            and (not request_id or log.request_id == request_id)
+            and (not query or query in self._search_text(log))
+        ]
+
+    def _search_text(self, log: AuditLog) -> str:
+        """Return the lowercased details and error message of a log."""
+        text = self._search_texts.get(log.id)
+        if text is None:
+            # Built on the first search that reaches this log, then reused
+            text = f"{log.details}\0{log.error_message or ''}".lower()
+            self._search_texts[log.id] = text
+        return text
+
+    def _paginate(
+        self, logs: List[AuditLog], page: int, page_size: int
+    ) -> Dict[str, Any]:
+        """Return the requested page of oldest-first logs, newest first."""
+        total_count = len(logs)
         start_idx = (page - 1) * page_size
         end_idx = start_idx + page_size
-        paginated_logs = filtered[start_idx:end_idx]
+
+        # Page k counted from the newest log is a slice from the end; no sort
+        # is needed since the cache is already in timestamp order
+        page_logs = logs[
+            max(total_count - end_idx, 0) : max(total_count - start_idx, 0)
+        ]
+        page_logs.reverse()
+        has_more = end_idx < total_count
 
         return {
-            "logs": paginated_logs,
+            "logs": page_logs,
             "total_count": total_count,
             "page": page,
             "page_size": page_size,
-            "has_more": end_idx < total_count,
+            "has_more": has_more,
+            "next_cursor": (
+                (page_logs[-1].timestamp, page_logs[-1].id)
+                if has_more and page_logs
+                else None
+            ),
+        }
+
+    def _paginate_after(
+        self,
+        logs: List[AuditLog],
+        cursor: Tuple[datetime, str],
+        page: int,
+        page_size: int,
+    ) -> Dict[str, Any]:
+        """Return the oldest-first logs before cursor, newest first."""
+        # Order timestamp ties by id, as the database does, so a cursor never
+        # skips or repeats logs that share a timestamp
+        logs.sort(key=lambda log: (log.timestamp, log.id))
+        # Database cursors carry an aware timestamp (timestamptz)
+        cursor = (_naive_local(cursor[0]), cursor[1])
+        before = [log for log in logs if (log.timestamp, log.id) < cursor]
+        page_logs = before[-page_size:]
+        page_logs.reverse()
+        has_more = len(before) > page_size
+
+        return {
+            "logs": page_logs,
+            "total_count": len(logs),
+            "page": page,
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": (
+                (page_logs[-1].timestamp, page_logs[-1].id)
+                if has_more and page_logs
+                else None
+            ),
         }
 
     def get_media_assets(
@@ -560,16 +947,23 @@ class AuditService:
 
     def get_or_create_conversation_audit(self, thread_id: str) -> ConversationAudit:
         """Get or create conversation audit for a thread"""
-        if thread_id in self._conversation_audits:
-            return self._conversation_audits[thread_id]
+        audit = self._conversation_audits.get(thread_id)
+        if audit is None:
+            audit = self._new_conversation_audit(thread_id, datetime.now())
+        return audit
 
+    def _new_conversation_audit(
+        self, thread_id: str, now: datetime
+    ) -> ConversationAudit:
+        """Create and cache the conversation audit for a new thread"""
         audit = ConversationAudit(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             thread_id=thread_id,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
         )
         self._conversation_audits[thread_id] = audit
+        self._conversation_members[thread_id] = set()
         return audit
 
     def update_conversation_audit(
@@ -581,17 +975,23 @@ class AuditService:
         command: Optional[str] = None,
     ):
         """Update conversation audit with new activity"""
-        audit = self.get_or_create_conversation_audit(thread_id)
-        audit.updated_at = datetime.now()
-
-        if participant_id and participant_id not in audit.participant_ids:
-            audit.participant_ids.append(participant_id)
-        if agent_handle and agent_handle not in audit.agent_handles:
-            audit.agent_handles.append(agent_handle)
-        if media_asset_id and media_asset_id not in audit.media_assets:
-            audit.media_assets.append(media_asset_id)
-        if command and command not in audit.commands_executed:
-            audit.commands_executed.append(command)
+        now = datetime.now()
+        audit = self._conversation_audits.get(thread_id)
+        if audit is None:
+            audit = self._new_conversation_audit(thread_id, now)
+        else:
+            audit.updated_at = now
+
+        members = self._conversation_members[thread_id]
+        for field, value in (
+            ("participant_ids", participant_id),
+            ("agent_handles", agent_handle),
+            ("media_assets", media_asset_id),
+            ("commands_executed", command),
+        ):
+            if value and (field, value) not in members:
+                members.add((field, value))
+                getattr(audit, field).append(value)
 
     def get_conversation_audit(self, thread_id: str) -> Optional[ConversationAudit]:
         """Get conversation audit for a thread"""
@@ -622,79 +1022,85 @@ class AuditService:
         Returns:
             String representation of exported logs
         """
-        logs = self.get_logs_sync(
-            start_date=start_date, end_date=end_date, page_size=10000
-        )["logs"]
-        logs = self.get_logs(start_date=start_date, end_date=end_date, page_size=10000)[
-            "logs"
-        ]
+        return "".join(self.export_logs_iter(start_date, end_date, format))
 
-        if format == "json":
-            import json
+    def export_logs_iter(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        format: str = "json",
+        limit: int = 10000,
+        fields: Sequence[str] = EXPORT_CSV_FIELDS,
+    ) -> Iterator[str]:
+        """
+        Export audit logs newest first, one record per chunk.
 
-            return json.dumps([log.dict() for log in logs], default=str)
+        Only the current record is serialized at a time, so the iterator
+        can be passed straight to a StreamingResponse.
 
-        elif format == "csv":
-            import io
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+            format: Export format (json, csv)
+            limit: Maximum number of logs to export
+            fields: AuditLog fields to export as CSV columns
+        """
+        logs = itertools.islice(
+            reversed(self._filter_logs(start_date=start_date, end_date=end_date)),
+            limit,
+        )
 
-            import csv
+        writer = _ExportWriter(format, fields)
+        yield writer.header()
+        for log in logs:
+            yield writer.record(log)
+        yield writer.footer()
 
-            output = io.StringIO()
-            writer = csv.writer(output)
-            writer.writerow(
-                [
-                    "timestamp",
-                    "event_type",
-                    "user_id",
-                    "resource_type",
-                    "resource_id",
-                    "status",
-                    "thread_id",
-                ]
-            )
-            for log in logs:
-                writer.writerow(
-                    [
-                        log.timestamp,
-                        log.event_type.value,
-                        log.user_id,
-                        log.resource_type,
-                        log.resource_id,
-                        log.status,
-                        log.thread_id,
-                    ]
-                )
-            return output.getvalue()
+    async def export_logs_aiter(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        format: str = "json",
+        limit: int = 10000,
+        fields: Sequence[str] = EXPORT_CSV_FIELDS,
+    ) -> AsyncIterator[str]:
+        """
+        Export audit logs newest first, one record per chunk.
 
-        return str([log.dict() for log in logs])
+        Same output as export_logs_iter, but a healthy database is read
+        through a cursor, so logs no longer in the cache are exported too.
+        """
+        if not (self._database_service and await self._database_service.health_check()):
+            for chunk in self.export_logs_iter(
+                start_date, end_date, format, limit, fields
+            ):
+                yield chunk
+            return
+
+        writer = _ExportWriter(format, fields)
+        yield writer.header()
+        async for log in self._database_service.iter_audit_logs(
+            start_date, end_date, limit
+        ):
+            yield writer.record(log)
+        yield writer.footer()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get audit trail statistics"""
-        total_logs = len(self._logs)
-        total_media = len(self._media_assets)
-        total_conversations = len(self._conversation_audits)
-
-        # Count by event type
-        event_counts: Dict[str, int] = {}
-        for log in self._logs.values():
-            et = log.event_type.value
-            event_counts[et] = event_counts.get(et, 0) + 1
-
-        # Count media by type
-        video_count = sum(
-            1 for m in self._media_assets.values() if m.asset_type == "video"
-        )
-        image_count = sum(
-            1 for m in self._media_assets.values() if m.asset_type == "image"
-        )
+        # The event type index already tracks inserts, evictions and clears
+        event_counts = {
+            event_type.value: len(ids)
+            for event_type, ids in self._by_event_type.items()
+        }
 
         return {
-            "total_logs": total_logs,
-            "total_media_assets": total_media,
-            "total_conversations": total_conversations,
+            "total_logs": len(self._logs),
+            "total_media_assets": len(self._media_assets),
+            "total_conversations": len(self._conversation_audits),
             "event_type_counts": event_counts,
-            "video_count": video_count,
-            "image_count": image_count,
+            "video_count": self._media_type_counts["video"],
+            "image_count": self._media_type_counts["image"],
+            "dropped_database_writes": self._dropped_writes,
         }
 
     def clear_logs(
@@ -727,7 +1133,7 @@ class AuditService:
                 to_delete.append(log_id)
 
         for log_id in to_delete:
-            del self._logs[log_id]
+            self._remove_log(log_id)
 
         logger.info(f"Cleared {len(to_delete)} audit logs from memory")
         return len(to_delete)
@@ -3,10 +3,13 @@ Auth0 Authentication Service
 Handles Auth0 JWT validation and user management.
 """
 
-import json
+import asyncio
+import functools
+import logging
+import time
 import httpx
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from urllib.parse import urlencode
 import jwt
 from config import (
     AUTH0_DOMAIN,
@@ -14,8 +17,16 @@ from config import (
     AUTH0_CLIENT_SECRET,
     AUTH0_AUDIENCE,
     AUTH0_ENABLED,
+    JWT_LEEWAY_SECONDS,
 )
 
+logger = logging.getLogger(__name__)
+
+# How long a fetched JWKS is fresh, and how much longer it may still be
+# served (while a background refresh runs) if refreshing it fails (seconds)
+JWKS_CACHE_TTL = 5 * 60
+JWKS_MAX_STALE = 15 * 60
+
 
 class Auth0Service:
     """Service for Auth0 authentication and token validation."""
@@ -27,9 +38,64 @@ class Auth0Service:
         self.audience = AUTH0_AUDIENCE
         self.enabled = AUTH0_ENABLED
 
+        # The configured API audience, or None if it is empty or a placeholder
+        self._audience_value: Optional[str] = (
+            self.audience
+            if self.audience
+            and self.audience.strip()
+            and self.audience not in ("****", "YOUR_API_AUDIENCE")
+            else None
+        )
+
+        # jwt.decode arguments for validate_token, which do not change per
+        # token. Without a valid audience the client_id is passed and "aud"
+        # is not checked.
+        self._decode_audience = self._audience_value or self.client_id
+        self._decode_issuer = self.issuer
+        self._decode_options = {
+            "verify_aud": self._audience_value is not None,
+            "verify_iss": True,
+        }
+
+        # /authorize query parameters that are the same for every login URL.
+        # The audience is only included if valid, which avoids the "Service
+        # not found" error when it is misconfigured.
+        self._authorize_base_params = {
+            "client_id": self.client_id,
+            "response_type": "code",
+        }
+        if self._audience_value:
+            self._authorize_base_params["audience"] = self._audience_value
+        # Encoded URL prefix per (redirect_uri, scope); bounded because the
+        # redirect URI comes from the client
+        self._authorize_prefix = functools.lru_cache(maxsize=128)(
+            self._build_authorize_prefix
+        )
+
         # JWKS cache for token validation
         self._jwks: Optional[Dict[str, Any]] = None
-        self._jwks_expires: Optional[datetime] = None
+        # Expiry times on the time.monotonic() clock
+        self._jwks_expires = 0.0
+        self._jwks_stale_until = 0.0
+        self._jwks_refresh_task: Optional[asyncio.Task] = None
+        # Public keys from the cached JWKS, parsed once per fetch, by key ID
+        self._signing_keys: Dict[str, Any] = {}
+
+        # HTTP client shared by all calls to Auth0, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client that keeps connections to Auth0 alive between calls."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @property
     def issuer(self) -> str:
@@ -42,24 +108,68 @@ class Auth0Service:
         return f"{self.issuer}/.well-known/jwks.json"
 
     async def get_jwks(self) -> Dict[str, Any]:
-        """Get the JSON Web Key Set for token validation."""
-        # Cache for 1 hour
-        if self._jwks and self._jwks_expires and datetime.now() < self._jwks_expires:
-            return self._jwks
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.jwks_url)
-            response.raise_for_status()
-            self._jwks = response.json()
-            self._jwks_expires = datetime.now() + timedelta(hours=1)
-            return self._jwks
+        """
+        Get the JSON Web Key Set for token validation.
 
-    def get_signing_key(self, jwks: Dict[str, Any], kid: str) -> Optional[str]:
-        """Get the signing key from JWKS by key ID."""
+        A fresh JWKS is served from cache. Once it expires it is still served
+        for up to JWKS_MAX_STALE while it is refreshed in the background;
+        after that, callers wait for the refresh. Concurrent callers share
+        a single in-flight fetch.
+        """
+        if self._jwks:
+            now = time.monotonic()
+            if now < self._jwks_expires:
+                return self._jwks
+            if now < self._jwks_stale_until:
+                self._start_jwks_refresh()
+                return self._jwks
+
+        # Shielded so that a cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(self._start_jwks_refresh())
+
+    def _start_jwks_refresh(self) -> asyncio.Task:
+        """Start a JWKS fetch unless one is already in flight, and return it."""
+        task = self._jwks_refresh_task
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh_jwks())
+            task.add_done_callback(self._log_jwks_refresh_failure)
+            self._jwks_refresh_task = task
+        return task
+
+    async def _refresh_jwks(self) -> Dict[str, Any]:
+        """Fetch the JWKS from Auth0 and replace the cached one."""
+        response = await self.client.get(self.jwks_url)
+        response.raise_for_status()
+        jwks = response.json()
+        self._signing_keys = self._parse_signing_keys(jwks)
+        self._jwks = jwks
+        self._jwks_expires = time.monotonic() + JWKS_CACHE_TTL
+        self._jwks_stale_until = self._jwks_expires + JWKS_MAX_STALE
+        return jwks
+
+    @staticmethod
+    def _log_jwks_refresh_failure(task: asyncio.Task):
+        """Log a failed JWKS fetch; any cached keys stay in use."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Auth0 JWKS refresh failed: {task.exception()}")
+
+    @staticmethod
+    def _parse_signing_keys(jwks: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse the RSA public keys of a JWKS, by key ID."""
+        signing_keys = {}
         for key in jwks.get("keys", []):
-            if key.get("kid") == kid:
-                return jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
-        return None
+            kid = key.get("kid")
+            if not kid:
+                continue
+            try:
+                signing_keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(key)
+            except jwt.InvalidKeyError:
+                continue  # Not an RSA key, so it cannot sign RS256 tokens
+        return signing_keys
+
+    def get_signing_key(self, kid: str) -> Optional[Any]:
+        """Get the parsed signing key from the cached JWKS by key ID."""
+        return self._signing_keys.get(kid)
 
     async def validate_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
@@ -75,8 +185,8 @@ class Auth0Service:
             return None
 
         try:
-            # Get JWKS for validation
-            jwks = await self.get_jwks()
+            # Make sure the JWKS (and its parsed keys) are loaded
+            await self.get_jwks()
 
             # Decode header to get key ID
             header = jwt.get_unverified_header(token)
@@ -86,28 +196,19 @@ class Auth0Service:
                 return None
 
             # Get signing key
-            signing_key = self.get_signing_key(jwks, kid)
+            signing_key = self.get_signing_key(kid)
             if not signing_key:
                 return None
 
-            # Use audience for validation only if it's a valid, non-placeholder value
-            # This matches the logic in get_login_url
-            valid_audience = None
-            if (
-                self.audience
-                and self.audience.strip()
-                and self.audience not in ("****", "YOUR_API_AUDIENCE")
-            ):
-                valid_audience = self.audience
-
-            # Validate token - if no valid audience, use client_id as default
+            # Validate token with the arguments prepared in __init__
             payload = jwt.decode(
                 token,
                 key=signing_key,
                 algorithms=["RS256"],
-                audience=valid_audience or self.client_id,
-                issuer=self.issuer,
-                options={"verify_aud": bool(valid_audience), "verify_iss": True},
+                audience=self._decode_audience,
+                issuer=self._decode_issuer,
+                options=self._decode_options,
+                leeway=JWT_LEEWAY_SECONDS,
             )
 
             return payload
@@ -116,14 +217,10 @@ class Auth0Service:
             return None
         except jwt.InvalidTokenError as e:
             # Log for debugging but don't expose errors
-            import logging
-
-            logging.getLogger(__name__).warning(f"Auth0 token validation failed: {e}")
+            logger.warning(f"Auth0 token validation failed: {e}")
             return None
         except Exception as e:
-            import logging
-
-            logging.getLogger(__name__).error(f"Auth0 token validation error: {e}")
+            logger.error(f"Auth0 token validation error: {e}")
             return None
 
     async def get_user_info(self, token: str) -> Optional[Dict[str, Any]]:
@@ -140,13 +237,12 @@ class Auth0Service:
             return None
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.issuer}/userinfo",
-                    headers={"Authorization": f"Bearer {token}"},
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.client.get(
+                f"{self.issuer}/userinfo",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception:
             return None
 
@@ -163,10 +259,6 @@ class Auth0Service:
         Returns:
             Token response with access_token, id_token, etc. or None
         """
-        import logging
-
-        logger = logging.getLogger(__name__)
-
         if not self.enabled:
             logger.error("Auth0 not enabled but exchange_code_for_token was called")
             return None
@@ -176,19 +268,18 @@ class Auth0Service:
             return None
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.issuer}/oauth/token",
-                    data={
-                        "grant_type": "authorization_code",
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "code": code,
-                        "redirect_uri": redirect_uri,
-                    },
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.client.post(
+                f"{self.issuer}/oauth/token",
+                data={
+                    "grant_type": "authorization_code",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "code": code,
+                    "redirect_uri": redirect_uri,
+                },
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"Auth0 token exchange HTTP error: {e.response.status_code} - {e.response.text}")
             return None
@@ -215,28 +306,24 @@ class Auth0Service:
         Returns:
             Full Auth0 login URL
         """
-        from urllib.parse import urlencode
-
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": redirect_uri,
-            "response_type": "code",
-            "scope": scope,
-        }
+        url = self._authorize_prefix(redirect_uri, scope)
 
+        params = {}
         if state:
             params["state"] = state
         if connection:
             params["connection"] = connection
-        # Only include audience if it's a valid, non-empty, non-placeholder value
-        # This avoids the "Service not found" error when audience is misconfigured
-        if (
-            self.audience
-            and self.audience.strip()
-            and self.audience not in ("****", "YOUR_API_AUDIENCE")
-        ):
-            params["audience"] = self.audience
+        if params:
+            url = f"{url}&{urlencode(params)}"
+        return url
 
+    def _build_authorize_prefix(self, redirect_uri: str, scope: str) -> str:
+        """Build the /authorize URL up to the per-login parameters."""
+        params = {
+            **self._authorize_base_params,
+            "redirect_uri": redirect_uri,
+            "scope": scope,
+        }
         return f"{self.issuer}/authorize?{urlencode(params)}"
 
     def get_logout_url(self, return_to: str, client_id: Optional[str] = None) -> str:
@@ -254,8 +341,7 @@ class Auth0Service:
         if client_id or self.client_id:
             params["client_id"] = client_id or self.client_id
 
-        query_string = "&".join(f"{k}={v}" for k, v in params.items())
-        return f"{self.issuer}/v2/logout?{query_string}"
+        return f"{self.issuer}/v2/logout?{urlencode(params)}"
 
     def normalize_user(self, auth0_user: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -267,19 +353,23 @@ class Auth0Service:
         Returns:
             Normalized user object
         """
+        # sub and picture each feed more than one field; look them up once
+        get = auth0_user.get
+        sub = get("sub")
+        picture = get("picture")
         return {
-            "sub": auth0_user.get("sub"),
-            "user_id": auth0_user.get("user_id") or auth0_user.get("sub"),
-            "email": auth0_user.get("email"),
-            "email_verified": auth0_user.get("email_verified", False),
-            "name": auth0_user.get("name"),
-            "nickname": auth0_user.get("nickname"),
-            "picture": auth0_user.get("picture"),
-            "updated_at": auth0_user.get("updated_at"),
-            "auth0_id": auth0_user.get("sub"),
+            "sub": sub,
+            "user_id": get("user_id") or sub,
+            "email": get("email"),
+            "email_verified": get("email_verified", False),
+            "name": get("name"),
+            "nickname": get("nickname"),
+            "picture": picture,
+            "updated_at": get("updated_at"),
+            "auth0_id": sub,
             # Handle social provider data
-            "github_login": auth0_user.get("nickname", ""),
-            "avatar_url": auth0_user.get("picture"),
+            "github_login": get("nickname", ""),
+            "avatar_url": picture,
         }
 
 
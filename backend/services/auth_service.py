@@ -3,14 +3,25 @@ Authentication Service
 Handles GitHub OAuth flow and JWT token management.
 """
 
+import asyncio
 import os
 import secrets
+import time
 import httpx
+import jwt
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+from datetime import datetime
+from typing import Optional
+from urllib.parse import urlencode
 from pydantic import BaseModel
 
+from config import (
+    JWT_SECRET_KEY,
+    JWT_ALGORITHM,
+    JWT_ACCESS_TOKEN_EXPIRE_MINUTES,
+    JWT_LEEWAY_SECONDS,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,8 +75,8 @@ class JWTPayload(BaseModel):
     sub: str  # user ID
     github_id: int
     github_login: str
-    exp: datetime
-    iat: datetime
+    exp: int  # Unix timestamp
+    iat: int  # Unix timestamp
 
 
 # =============================================================================
@@ -78,11 +89,12 @@ GITHUB_OAUTH_CALLBACK_URL = os.getenv(
     "GITHUB_OAUTH_CALLBACK_URL", "http://localhost:8000/auth/github/callback"
 )
 
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", secrets.token_urlsafe(32))
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(
-    os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60480")
-)  # 7 days
+# Constant request headers for the OAuth token exchange and the REST API
+GITHUB_TOKEN_HEADERS = {"Accept": "application/json"}
+GITHUB_API_HEADERS = {"Accept": "application/vnd.github.v3+json"}
+
+# JWT settings (JWT_SECRET_KEY, JWT_ALGORITHM, JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+# come from config, which also derives the OAuth state secret from the key
 
 
 # =============================================================================
@@ -96,15 +108,13 @@ class JWTService:
     @staticmethod
     def create_access_token(user_id: str, github_id: int, github_login: str) -> str:
         """Create a JWT access token"""
-        import jwt
-
-        now = datetime.utcnow()
+        now = int(time.time())
         payload = {
             "sub": user_id,
             "github_id": github_id,
             "github_login": github_login,
             "iat": now,
-            "exp": now + timedelta(minutes=JWT_ACCESS_TOKEN_EXPIRE_MINUTES),
+            "exp": now + JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         }
 
         return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
@@ -112,10 +122,13 @@ class JWTService:
     @staticmethod
     def decode_token(token: str) -> Optional[JWTPayload]:
         """Decode and validate a JWT token"""
-        import jwt
-
         try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+            payload = jwt.decode(
+                token,
+                JWT_SECRET_KEY,
+                algorithms=[JWT_ALGORITHM],
+                leeway=JWT_LEEWAY_SECONDS,
+            )
             return JWTPayload(**payload)
         except jwt.ExpiredSignatureError:
             logger.warning("Token expired")
@@ -138,6 +151,22 @@ class AuthService:
         self.client_secret = GITHUB_CLIENT_SECRET
         self.redirect_uri = GITHUB_OAUTH_CALLBACK_URL
 
+        # HTTP client shared by all calls to GitHub, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client that keeps connections to GitHub alive between calls"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def get_github_auth_url(
         self, state: Optional[str] = None, redirect_uri: Optional[str] = None
     ) -> str:
@@ -164,11 +193,7 @@ class AuthService:
             "state": state,
         }
 
-        return f"https://github.com/login/oauth/authorize?{self._format_params(params)}"
-
-    def _format_params(self, params: Dict[str, str]) -> str:
-        """Format parameters as URL query string"""
-        return "&".join(f"{k}={v}" for k, v in params.items())
+        return f"https://github.com/login/oauth/authorize?{urlencode(params)}"
 
     async def exchange_code_for_token(
         self, code: str, state: str, redirect_uri: Optional[str] = None
@@ -197,14 +222,13 @@ class AuthService:
             "redirect_uri": final_redirect_uri,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://github.com/login/oauth/access_token",
-                data=data,
-                headers={"Accept": "application/json"},
-            )
-            response.raise_for_status()
-            return OAuthTokenResponse(**response.json())
+        response = await self.client.post(
+            "https://github.com/login/oauth/access_token",
+            data=data,
+            headers=GITHUB_TOKEN_HEADERS,
+        )
+        response.raise_for_status()
+        return OAuthTokenResponse(**response.json())
 
     async def get_github_user(self, access_token: str) -> GitHubUser:
         """
@@ -219,16 +243,12 @@ class AuthService:
         Raises:
             httpx.HTTPStatusError: If user fetch fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-            )
-            response.raise_for_status()
-            return GitHubUser(**response.json())
+        response = await self.client.get(
+            "https://api.github.com/user",
+            headers={**GITHUB_API_HEADERS, "Authorization": f"Bearer {access_token}"},
+        )
+        response.raise_for_status()
+        return GitHubUser(**response.json())
 
     async def get_user_emails(self, access_token: str) -> list:
         """
@@ -240,16 +260,49 @@ class AuthService:
         Returns:
             List of email dictionaries
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.github.com/user/emails",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.get(
+            "https://api.github.com/user/emails",
+            headers={**GITHUB_API_HEADERS, "Authorization": f"Bearer {access_token}"},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_github_user_and_emails(
+        self, access_token: str
+    ) -> tuple[GitHubUser, list]:
+        """
+        Fetch the user profile and emails from GitHub concurrently.
+
+        If the profile has no public email, it is filled in with the primary
+        verified email. Failing to fetch the emails is not fatal.
+
+        Args:
+            access_token: GitHub OAuth access token
+
+        Returns:
+            Tuple of (GitHub user profile, list of email dictionaries)
+
+        Raises:
+            httpx.HTTPStatusError: If user fetch fails
+        """
+        github_user, emails = await asyncio.gather(
+            self.get_github_user(access_token),
+            self.get_user_emails(access_token),
+            return_exceptions=True,
+        )
+        if isinstance(github_user, BaseException):
+            raise github_user
+        if isinstance(emails, BaseException):
+            logger.warning(f"Failed to fetch GitHub user emails: {emails}")
+            emails = []
+
+        if not github_user.email:
+            for email in emails:
+                if email.get("primary") and email.get("verified"):
+                    github_user.email = email.get("email")
+                    break
+
+        return github_user, emails
 
     def create_user_session(
         self, github_user: GitHubUser, user_id: Optional[str] = None
@@ -5,18 +5,296 @@ Provides persistent storage for audit logs, media assets, and conversation audit
 Supports connection pooling, async operations, and automatic retries.
 """
 
+import asyncio
+import csv
+import heapq
+import io
 import json
 import logging
+import time
+import uuid
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 
 import asyncpg
 
-from config import DATABASE_URL, DATABASE_ENABLED
-from models import AuditLog, AuditEventType, MediaAsset, ConversationAudit
+from config import (
+    DATABASE_URL,
+    DATABASE_ENABLED,
+    DATABASE_POOL_MIN_SIZE,
+    DATABASE_POOL_MAX_SIZE,
+    DATABASE_POOL_MAX_IDLE,
+    DATABASE_STATEMENT_CACHE_SIZE,
+    DATABASE_COMMAND_TIMEOUT,
+    DATABASE_ANALYTICS_TIMEOUT,
+)
+from models import AuditLog, MediaAsset, ConversationAudit
 
 logger = logging.getLogger(__name__)
 
+# Use orjson for jsonb values and exports when installed, stdlib json
+# otherwise. Both write datetimes in ISO 8601 and fall back to str() for
+# unknown types.
+try:
+    import orjson
+
+    def _dumps(data: Any) -> str:
+        return orjson.dumps(data, default=str).decode()
+
+    def _encode_jsonb(value: Any) -> bytes:
+        """Encode a value in the jsonb binary format (version 1 + JSON text)."""
+        return b"\x01" + orjson.dumps(value, default=str)
+
+    def _decode_jsonb(data: bytes) -> Any:
+        """Decode a jsonb value from its binary format."""
+        return orjson.loads(memoryview(data)[1:])
+
+except ImportError:
+
+    def _json_default(value: Any) -> str:
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+
+    def _dumps(data: Any) -> str:
+        return json.dumps(data, default=_json_default)
+
+    def _encode_jsonb(value: Any) -> bytes:
+        """Encode a value in the jsonb binary format (version 1 + JSON text)."""
+        return b"\x01" + json.dumps(value, default=_json_default).encode()
+
+    def _decode_jsonb(data: bytes) -> Any:
+        """Decode a jsonb value from its binary format."""
+        return json.loads(data[1:])
+
+
+# Most audit logs kept in memory when the database is off or a write fails
+MEMORY_MAX_LOGS = 50000
+
+# Seconds a health_check result is reused before the database is probed again
+HEALTH_CHECK_TTL = 1.0
+
+# Unfiltered audit_logs counts of at least this many rows use the planner's
+# estimate (exact counting scans the whole table); smaller tables, and
+# tables never analyzed (estimate -1), are counted exactly
+APPROX_COUNT_THRESHOLD = 100000
+COUNT_ESTIMATE_SQL = (
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'audit_logs'::regclass"
+)
+
+# Rows fetched per round trip when streaming logs from a server-side cursor
+EXPORT_PREFETCH = 1000
+
+# Columns of the CSV export, in order
+EXPORT_CSV_COLUMNS = (
+    "id",
+    "timestamp",
+    "event_type",
+    "user_id",
+    "resource_type",
+    "resource_id",
+    "status",
+    "thread_id",
+    "post_id",
+    "ip_address",
+    "details",
+)
+EXPORT_CSV_SELECT = ", ".join(EXPORT_CSV_COLUMNS)
+
+# audit_logs columns in the order produced by _audit_log_record
+AUDIT_LOG_COLUMNS = (
+    "id",
+    "timestamp",
+    "event_type",
+    "user_id",
+    "session_id",
+    "ip_address",
+    "user_agent",
+    "resource_type",
+    "resource_id",
+    "details",
+    "status",
+    "error_message",
+    "thread_id",
+    "post_id",
+    "agent_run_id",
+    "correlation_id",
+    "request_id",
+    "response_time_ms",
+)
+
+
+# Insert one audit_logs row (parameters from _audit_log_record), updating
+# the mutable fields if the log was stored before
+UPSERT_AUDIT_LOG_SQL = """
+    INSERT INTO audit_logs (
+        id, timestamp, event_type, user_id, session_id, ip_address,
+        user_agent, resource_type, resource_id, details, status,
+        error_message, thread_id, post_id, agent_run_id,
+        correlation_id, request_id, response_time_ms
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18)
+    ON CONFLICT (id) DO UPDATE SET
+        timestamp = EXCLUDED.timestamp,
+        event_type = EXCLUDED.event_type,
+        status = EXCLUDED.status,
+        error_message = EXCLUDED.error_message,
+        details = EXCLUDED.details
+"""
+
+# Insert one media_assets row (parameters from _media_asset_record),
+# updating the fields that change as generation completes
+UPSERT_MEDIA_ASSET_SQL = """
+    INSERT INTO media_assets (
+        id, created_at, asset_type, url, prompt, generated_by,
+        service, thread_id, post_id, duration_seconds, thumbnail_url,
+        status, metadata
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+    ON CONFLICT (id) DO UPDATE SET
+        url = EXCLUDED.url,
+        status = EXCLUDED.status,
+        thumbnail_url = EXCLUDED.thumbnail_url
+    RETURNING id
+"""
+
+# Every get_stats figure in one round trip. Each table is scanned once:
+# the total log count is the sum of the per-event-type counts.
+STATS_SQL = """
+    WITH event_counts AS (
+        SELECT event_type, COUNT(*) AS count FROM audit_logs GROUP BY event_type
+    ), media_counts AS (
+        SELECT
+            COUNT(*) AS total_media,
+            COUNT(*) FILTER (WHERE asset_type = 'video') AS video_count,
+            COUNT(*) FILTER (WHERE asset_type = 'image') AS image_count
+        FROM media_assets
+    )
+    SELECT
+        (
+            SELECT COALESCE(jsonb_object_agg(event_type, count), '{}')
+            FROM event_counts
+        ) AS event_type_counts,
+        media_counts.*,
+        (SELECT COUNT(*) FROM conversation_audits) AS total_conversations
+    FROM media_counts
+"""
+
+
+def _audit_log_record(log: AuditLog) -> tuple:
+    """Build the audit_logs row for an AuditLog, ordered as AUDIT_LOG_COLUMNS."""
+    return (
+        log.id,
+        log.timestamp,
+        log.event_type.value,
+        log.user_id,
+        log.session_id,
+        log.ip_address,
+        log.user_agent,
+        log.resource_type,
+        log.resource_id,
+        log.details,
+        log.status,
+        log.error_message,
+        log.thread_id,
+        log.post_id,
+        log.agent_run_id,
+        log.correlation_id,
+        log.request_id,
+        log.response_time_ms,
+    )
+
+
+def _media_asset_record(asset: MediaAsset) -> tuple:
+    """Build the UPSERT_MEDIA_ASSET_SQL arguments for a MediaAsset."""
+    return (
+        asset.id,
+        asset.created_at,
+        asset.asset_type,
+        asset.url,
+        asset.prompt,
+        # "system" (or any other non-user id) is stored as NULL, which reads
+        # back as "system"
+        _uuid_param(asset.generated_by),
+        asset.service,
+        asset.thread_id,
+        asset.post_id,
+        asset.duration_seconds,
+        asset.thumbnail_url,
+        asset.status,
+        {},
+    )
+
+
+def _row_to_audit_log(row: asyncpg.Record) -> AuditLog:
+    """Build an AuditLog from an audit_logs row."""
+    # pydantic validates the event_type string straight into the enum, which
+    # is cheaper than looking the member up here and having it re-checked
+    return AuditLog(
+        id=str(row["id"]),
+        timestamp=row["timestamp"],
+        event_type=row["event_type"],
+        user_id=str(row["user_id"]) if row["user_id"] else None,
+        session_id=str(row["session_id"]) if row["session_id"] else None,
+        ip_address=str(row["ip_address"]) if row["ip_address"] else None,
+        user_agent=row["user_agent"],
+        resource_type=row["resource_type"],
+        resource_id=str(row["resource_id"]) if row["resource_id"] else None,
+        details=row["details"] or {},
+        status=row["status"],
+        error_message=row["error_message"],
+        thread_id=str(row["thread_id"]) if row["thread_id"] else None,
+        post_id=str(row["post_id"]) if row["post_id"] else None,
+        agent_run_id=str(row["agent_run_id"]) if row["agent_run_id"] else None,
+        correlation_id=row["correlation_id"],
+        request_id=row["request_id"],
+        response_time_ms=row["response_time_ms"],
+    )
+
+
+def _next_cursor(logs: List[AuditLog], has_more: bool) -> Optional[tuple]:
+    """Cursor (timestamp, id) for the page after logs, or None at the end."""
+    if not has_more or not logs:
+        return None
+    return (logs[-1].timestamp, logs[-1].id)
+
+
+def _naive_local(value: datetime) -> datetime:
+    """Convert an aware datetime to naive local time, like datetime.now()."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _uuid_param(value: str) -> Optional[uuid.UUID]:
+    """
+    Parse an id bound against a uuid column.
+
+    asyncpg sends uuid.UUID values in the binary uuid format, so the SQL
+    needs no ::uuid cast. A value that is not a UUID binds as NULL, which
+    matches no row.
+    """
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+async def _set_analytics_timeout(conn: asyncpg.Connection):
+    """Allow DATABASE_ANALYTICS_TIMEOUT per statement for the current transaction."""
+    await conn.execute(
+        f"SET LOCAL statement_timeout = {int(DATABASE_ANALYTICS_TIMEOUT * 1000)}"
+    )
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Exchange jsonb columns as Python objects on a new connection."""
+    # The binary format also works for COPY (copy_audit_logs), which has
+    # no text-format path
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+
 
 class DatabaseService:
     """
@@ -34,6 +312,10 @@ class DatabaseService:
         self._enabled = DATABASE_ENABLED
         self._initialized = False
 
+        # Last health_check result and when it was taken (monotonic seconds)
+        self._healthy = False
+        self._health_checked_at: Optional[float] = None
+
         # In-memory fallback when database is not available
         self._memory_logs: Dict[str, AuditLog] = {}
         self._memory_media: Dict[str, MediaAsset] = {}
@@ -52,9 +334,16 @@ class DatabaseService:
         try:
             self.pool = await asyncpg.create_pool(
                 DATABASE_URL,
-                min_size=2,
-                max_size=20,
-                command_timeout=30,
+                min_size=DATABASE_POOL_MIN_SIZE,
+                max_size=DATABASE_POOL_MAX_SIZE,
+                max_inactive_connection_lifetime=DATABASE_POOL_MAX_IDLE,
+                statement_cache_size=DATABASE_STATEMENT_CACHE_SIZE,
+                command_timeout=DATABASE_COMMAND_TIMEOUT,
+                # The server also cancels statements the client gave up on
+                server_settings={
+                    "statement_timeout": str(int(DATABASE_COMMAND_TIMEOUT * 1000))
+                },
+                init=_init_connection,
             )
             self._initialized = True
             logger.info("Database service initialized for audit trail")
@@ -76,6 +365,30 @@ class DatabaseService:
         """Check if database storage is enabled."""
         return self._enabled and self.pool is not None
 
+    async def health_check(self) -> bool:
+        """
+        Check that the database is enabled and answering queries.
+
+        The result is cached for HEALTH_CHECK_TTL seconds, so callers can
+        check before every query without adding a round trip to each.
+        """
+        if not self.is_enabled():
+            return False
+
+        now = time.monotonic()
+        checked_at = self._health_checked_at
+        if checked_at is not None and now - checked_at < HEALTH_CHECK_TTL:
+            return self._healthy
+
+        try:
+            await self.pool.fetchval("SELECT 1")
+            self._healthy = True
+        except Exception as e:
+            logger.warning(f"Database health check failed: {e}")
+            self._healthy = False
+        self._health_checked_at = now
+        return self._healthy
+
     # ========================================================================
     # AUDIT LOG METHODS
     # ========================================================================
@@ -92,55 +405,119 @@ class DatabaseService:
         """
         if not self.is_enabled():
             # Fallback to in-memory
-            self._memory_logs[log.id] = log
+            self._remember_log(log)
             return log.id
 
-        query = """
-            INSERT INTO audit_logs (
-                id, timestamp, event_type, user_id, session_id, ip_address,
-                user_agent, resource_type, resource_id, details, status,
-                error_message, thread_id, post_id, agent_run_id,
-                correlation_id, request_id, response_time_ms
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18)
-            ON CONFLICT (id) DO UPDATE SET
-                timestamp = EXCLUDED.timestamp,
-                event_type = EXCLUDED.event_type,
-                status = EXCLUDED.status,
-                error_message = EXCLUDED.error_message,
-                details = EXCLUDED.details
-            RETURNING id
-        """
-
         try:
             async with self.pool.acquire() as conn:
                 result = await conn.fetchrow(
-                    query,
-                    log.id,
-                    log.timestamp,
-                    log.event_type.value,
-                    log.user_id,
-                    log.session_id,
-                    log.ip_address,
-                    log.user_agent,
-                    log.resource_type,
-                    log.resource_id,
-                    json.dumps(log.details),
-                    log.status,
-                    log.error_message,
-                    log.thread_id,
-                    log.post_id,
-                    log.agent_run_id,
-                    log.details.get("correlation_id"),
-                    log.details.get("request_id"),
-                    log.details.get("response_time_ms"),
+                    UPSERT_AUDIT_LOG_SQL + " RETURNING id", *_audit_log_record(log)
                 )
                 return result["id"]
         except Exception as e:
             logger.error(f"Failed to store audit log: {e}")
             # Fallback to in-memory
-            self._memory_logs[log.id] = log
+            self._remember_log(log)
             return log.id
 
+    def _remember_log(self, log: AuditLog):
+        """
+        Keep a log in memory, for when it cannot be written to the database.
+
+        Holds at most MEMORY_MAX_LOGS logs, evicting the oldest first.
+        """
+        self._memory_logs[log.id] = log
+        if len(self._memory_logs) > MEMORY_MAX_LOGS:
+            del self._memory_logs[next(iter(self._memory_logs))]
+
+    async def store_audit_logs_bulk(self, logs: List[AuditLog]) -> int:
+        """
+        Store a batch of audit logs in one transaction.
+
+        The rows are sent with executemany, which pipelines them instead of
+        waiting for a round trip per log. If the batch fails, its logs are
+        stored one at a time and only those that fail are kept in memory.
+
+        Args:
+            logs: The audit log entries to store
+
+        Returns:
+            Number of logs stored
+        """
+        if not logs:
+            return 0
+
+        if not self.is_enabled():
+            for log in logs:
+                self._remember_log(log)
+            return len(logs)
+
+        try:
+            async with self.pool.acquire() as conn:
+                try:
+                    async with conn.transaction():
+                        await conn.executemany(
+                            UPSERT_AUDIT_LOG_SQL,
+                            [_audit_log_record(log) for log in logs],
+                        )
+                except Exception as e:
+                    # One bad row rolls back the whole batch: store the rows
+                    # one by one, so only the bad ones fall back to memory
+                    logger.warning(
+                        f"Failed to store {len(logs)} audit logs as a batch: {e}"
+                    )
+                    for log in logs:
+                        try:
+                            await conn.execute(
+                                UPSERT_AUDIT_LOG_SQL, *_audit_log_record(log)
+                            )
+                        except Exception as e:
+                            logger.error(f"Failed to store audit log {log.id}: {e}")
+                            self._remember_log(log)
+            return len(logs)
+        except Exception as e:
+            logger.error(f"Failed to store {len(logs)} audit logs: {e}")
+            # Fallback to in-memory
+            for log in logs:
+                self._remember_log(log)
+            return len(logs)
+
+    async def copy_audit_logs(self, logs: List[AuditLog]) -> int:
+        """
+        Bulk insert new audit logs with a single COPY.
+
+        Much faster than calling store_audit_log per row for seeding and
+        backfills, but COPY has no ON CONFLICT handling: the logs must not
+        be in the table yet. If the COPY fails (a value that does not fit its
+        column aborts it as a whole), the logs are stored with
+        store_audit_logs_bulk instead.
+
+        Args:
+            logs: The audit log entries to insert
+
+        Returns:
+            Number of logs written
+        """
+        if not logs:
+            return 0
+
+        if not self.is_enabled():
+            for log in logs:
+                self._remember_log(log)
+            return len(logs)
+
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.copy_records_to_table(
+                    "audit_logs",
+                    records=[_audit_log_record(log) for log in logs],
+                    columns=AUDIT_LOG_COLUMNS,
+                )
+            return len(logs)
+        except Exception as e:
+            logger.warning(f"Failed to copy {len(logs)} audit logs: {e}")
+            return await self.store_audit_logs_bulk(logs)
+
     async def query_audit_logs(
         self,
         event_type: Optional[str] = None,
@@ -154,10 +531,19 @@ class DatabaseService:
         search_query: Optional[str] = None,
         page: int = 1,
         page_size: int = 100,
+        after_timestamp: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        with_total: bool = True,
     ) -> Dict[str, Any]:
         """
         Query audit logs with filters and pagination.
 
+        Pages are either numbered (page, which costs more the deeper it is)
+        or follow a cursor (after_timestamp and after_id, taken from the
+        previous result's next_cursor), which costs the same on every page.
+
         Args:
             event_type: Filter by event type
             user_id: Filter by user ID
@@ -168,8 +554,14 @@ class DatabaseService:
             start_date: Filter events after this date
             end_date: Filter events before this date
             search_query: Search in details JSON
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when a cursor is given
             page_size: Number of results per page
+            after_timestamp: Timestamp of the last log on the previous page
+            after_id: ID of the last log on the previous page
+            correlation_id: Filter by correlation ID
+            request_id: Filter by request ID
+            with_total: Count the matching logs; when False, total_count is
+                None and the count query is skipped (has_more is still set)
 
         Returns:
             Dict with logs list and pagination info
@@ -187,6 +579,10 @@ class DatabaseService:
                 end_date=end_date,
                 page=page,
                 page_size=page_size,
+                after_timestamp=after_timestamp,
+                after_id=after_id,
+                correlation_id=correlation_id,
+                request_id=request_id,
             )
 
         # Build query dynamically
@@ -201,8 +597,8 @@ class DatabaseService:
 
         if user_id:
             param_count += 1
-            conditions.append(f"user_id = ${param_count}::uuid")
-            params.append(user_id)
+            conditions.append(f"user_id = ${param_count}")
+            params.append(_uuid_param(user_id))
 
         if resource_type:
             param_count += 1
@@ -211,13 +607,13 @@ class DatabaseService:
 
         if resource_id:
             param_count += 1
-            conditions.append(f"resource_id = ${param_count}::uuid")
-            params.append(resource_id)
+            conditions.append(f"resource_id = ${param_count}")
+            params.append(_uuid_param(resource_id))
 
         if thread_id:
             param_count += 1
-            conditions.append(f"thread_id = ${param_count}::uuid")
-            params.append(thread_id)
+            conditions.append(f"thread_id = ${param_count}")
+            params.append(_uuid_param(thread_id))
 
         if status:
             param_count += 1
@@ -234,69 +630,90 @@ class DatabaseService:
             conditions.append(f"timestamp <= ${param_count}")
             params.append(end_date)
 
+        if correlation_id:
+            param_count += 1
+            conditions.append(f"correlation_id = ${param_count}")
+            params.append(correlation_id)
+
+        if request_id:
+            param_count += 1
+            conditions.append(f"request_id = ${param_count}")
+            params.append(request_id)
+
         if search_query:
+            # Matches the expression of idx_audit_logs_details_trgm, so
+            # keep the two in sync
             param_count += 1
             conditions.append(f"details::text ILIKE ${param_count}")
             params.append(f"%{search_query}%")
 
         where_clause = " AND ".join(conditions) if conditions else "1=1"
+        use_cursor = after_timestamp is not None and after_id is not None
 
         try:
-            async with self.pool.acquire() as conn:
-                # Get total count
-                count_query = f"SELECT COUNT(*) FROM audit_logs WHERE {where_clause}"
-                total = await conn.fetchval(count_query, *params)
+            count_params = list(params)
 
-                # Get paginated results
-                offset = (page - 1) * page_size
+            # Get paginated results. A cursor seeks straight to the rows
+            # after it through idx_audit_logs_timestamp_id. One extra row
+            # is fetched to tell whether another page follows, since the
+            # total may be an estimate.
+            if use_cursor:
                 data_query = f"""
                     SELECT * FROM audit_logs
                     WHERE {where_clause}
-                    ORDER BY timestamp DESC
-                    LIMIT ${param_count + 1} OFFSET ${param_count + 2}
+                    AND (timestamp, id) < (${param_count + 1}, ${param_count + 2})
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ${param_count + 3}
                 """
-                params.extend([page_size, offset])
-
-                rows = await conn.fetch(data_query, *params)
-
-                # Convert rows to AuditLog objects
-                logs = []
-                for row in rows:
-                    logs.append(
-                        AuditLog(
-                            id=str(row["id"]),
-                            timestamp=row["timestamp"],
-                            event_type=AuditEventType(row["event_type"]),
-                            user_id=str(row["user_id"]) if row["user_id"] else None,
-                            session_id=str(row["session_id"])
-                            if row["session_id"]
-                            else None,
-                            ip_address=row["ip_address"],
-                            user_agent=row["user_agent"],
-                            resource_type=row["resource_type"],
-                            resource_id=str(row["resource_id"])
-                            if row["resource_id"]
-                            else None,
-                            details=row["details"] or {},
-                            status=row["status"],
-                            error_message=row["error_message"],
-                            thread_id=str(row["thread_id"])
-                            if row["thread_id"]
-                            else None,
-                            post_id=str(row["post_id"]) if row["post_id"] else None,
-                            agent_run_id=str(row["agent_run_id"])
-                            if row["agent_run_id"]
-                            else None,
-                        )
+                params.extend([after_timestamp, _uuid_param(after_id), page_size + 1])
+            elif page <= 1:
+                data_query = f"""
+                    SELECT * FROM audit_logs
+                    WHERE {where_clause}
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ${param_count + 1}
+                """
+                params.append(page_size + 1)
+            else:
+                # Deferred join: the OFFSET rows are skipped over ids
+                # alone, and only the rows on the page are read in full
+                offset = (page - 1) * page_size
+                data_query = f"""
+                    WITH page_ids AS (
+                        SELECT id, timestamp FROM audit_logs
+                        WHERE {where_clause}
+                        ORDER BY timestamp DESC, id DESC
+                        LIMIT ${param_count + 1} OFFSET ${param_count + 2}
                     )
+                    SELECT audit_logs.* FROM audit_logs
+                    JOIN page_ids USING (id)
+                    ORDER BY page_ids.timestamp DESC, page_ids.id DESC
+                """
+                params.extend([page_size + 1, offset])
+
+            if with_total:
+                # The count and the page run at the same time, each on its
+                # own pooled connection
+                total, rows = await asyncio.gather(
+                    self._count_audit_logs(where_clause, count_params),
+                    self.pool.fetch(data_query, *params),
+                )
+            else:
+                total = None
+                rows = await self.pool.fetch(data_query, *params)
+            has_more = len(rows) > page_size
+            rows = rows[:page_size]
+
+            logs = [_row_to_audit_log(row) for row in rows]
 
-                return {
-                    "logs": logs,
-                    "total_count": total,
-                    "page": page,
-                    "page_size": page_size,
-                    "has_more": offset + page_size < total,
-                }
+            return {
+                "logs": logs,
+                "total_count": total,
+                "page": page,
+                "page_size": page_size,
+                "has_more": has_more,
+                "next_cursor": _next_cursor(logs, has_more),
+            }
 
         except Exception as e:
             logger.error(f"Failed to query audit logs: {e}")
@@ -306,8 +723,25 @@ class DatabaseService:
                 "page": page,
                 "page_size": page_size,
                 "has_more": False,
+                "next_cursor": None,
             }
 
+    async def _count_audit_logs(self, where_clause: str, params: List[Any]) -> int:
+        """
+        Count the audit logs matching a WHERE clause.
+
+        Without filters, a large table is counted from the planner's row
+        estimate instead of a full scan; the estimate is refreshed by
+        (auto)vacuum and analyze.
+        """
+        if not params:
+            estimate = await self.pool.fetchval(COUNT_ESTIMATE_SQL)
+            if estimate >= APPROX_COUNT_THRESHOLD:
+                return estimate
+        return await self.pool.fetchval(
+            f"SELECT COUNT(*) FROM audit_logs WHERE {where_clause}", *params
+        )
+
     def _query_memory_logs(
         self,
         event_type: Optional[str] = None,
@@ -320,40 +754,53 @@ class DatabaseService:
         end_date: Optional[datetime] = None,
         page: int = 1,
         page_size: int = 100,
+        after_timestamp: Optional[datetime] = None,
+        after_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        request_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Query in-memory logs with filters."""
-        filtered = list(self._memory_logs.values())
-
-        if event_type:
-            filtered = [log for log in filtered if log.event_type.value == event_type]
-        if user_id:
-            filtered = [log for log in filtered if log.user_id == user_id]
-        if resource_type:
-            filtered = [log for log in filtered if log.resource_type == resource_type]
-        if resource_id:
-            filtered = [log for log in filtered if log.resource_id == resource_id]
-        if thread_id:
-            filtered = [log for log in filtered if log.thread_id == thread_id]
-        if status:
-            filtered = [log for log in filtered if log.status == status]
-        if start_date:
-            filtered = [log for log in filtered if log.timestamp >= start_date]
-        if end_date:
-            filtered = [log for log in filtered if log.timestamp <= end_date]
-
-        filtered.sort(key=lambda x: x.timestamp, reverse=True)
+        # One pass over the logs, each filter short-circuiting when unset
+        filtered = [
+            log
+            for log in self._memory_logs.values()
+            if (not event_type or log.event_type.value == event_type)
+            and (not user_id or log.user_id == user_id)
+            and (not resource_type or log.resource_type == resource_type)
+            and (not resource_id or log.resource_id == resource_id)
+            and (not thread_id or log.thread_id == thread_id)
+            and (not status or log.status == status)
+            and (not start_date or log.timestamp >= start_date)
+            and (not end_date or log.timestamp <= end_date)
+            and (not correlation_id or log.correlation_id == correlation_id)
+            and (not request_id or log.request_id == request_id)
+        ]
 
         total_count = len(filtered)
-        start_idx = (page - 1) * page_size
+        if after_timestamp is not None and after_id is not None:
+            # Database cursors carry an aware timestamp (timestamptz)
+            cursor = (_naive_local(after_timestamp), after_id)
+            filtered = [log for log in filtered if (log.timestamp, log.id) < cursor]
+            start_idx = 0
+        else:
+            start_idx = (page - 1) * page_size
         end_idx = start_idx + page_size
-        paginated_logs = filtered[start_idx:end_idx]
+
+        # Only the rows up to the page end (plus one, for has_more) are
+        # ordered, instead of sorting every match
+        newest = heapq.nlargest(
+            end_idx + 1, filtered, key=lambda x: (x.timestamp, x.id)
+        )
+        paginated_logs = newest[start_idx:end_idx]
+        has_more = len(newest) > end_idx
 
         return {
             "logs": paginated_logs,
             "total_count": total_count,
             "page": page,
             "page_size": page_size,
-            "has_more": end_idx < total_count,
+            "has_more": has_more,
+            "next_cursor": _next_cursor(paginated_logs, has_more),
         }
 
     # ========================================================================
@@ -374,43 +821,50 @@ class DatabaseService:
             self._memory_media[asset.id] = asset
             return asset.id
 
-        query = """
-            INSERT INTO media_assets (
-                id, created_at, asset_type, url, prompt, generated_by,
-                service, thread_id, post_id, duration_seconds, thumbnail_url,
-                status, metadata
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-            ON CONFLICT (id) DO UPDATE SET
-                url = EXCLUDED.url,
-                status = EXCLUDED.status,
-                thumbnail_url = EXCLUDED.thumbnail_url
-            RETURNING id
-        """
-
         try:
             async with self.pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    query,
-                    asset.id,
-                    asset.created_at,
-                    asset.asset_type,
-                    asset.url,
-                    asset.prompt,
-                    asset.generated_by,
-                    asset.service,
-                    asset.thread_id,
-                    asset.post_id,
-                    asset.duration_seconds,
-                    asset.thumbnail_url,
-                    asset.status,
-                    json.dumps({}),
+                return await conn.fetchval(
+                    UPSERT_MEDIA_ASSET_SQL, *_media_asset_record(asset)
                 )
-                return result["id"]
         except Exception as e:
             logger.error(f"Failed to store media asset: {e}")
             self._memory_media[asset.id] = asset
             return asset.id
 
+    async def store_media_assets_bulk(self, assets: List[MediaAsset]) -> int:
+        """
+        Store a batch of media assets over one pooled connection.
+
+        Each asset is written on its own, so one that fails (and is kept
+        in memory instead) does not roll back the others.
+
+        Args:
+            assets: The media assets to store
+
+        Returns:
+            Number of assets stored
+        """
+        if not self.is_enabled():
+            for asset in assets:
+                self._memory_media[asset.id] = asset
+            return len(assets)
+
+        try:
+            async with self.pool.acquire() as conn:
+                for asset in assets:
+                    try:
+                        await conn.execute(
+                            UPSERT_MEDIA_ASSET_SQL, *_media_asset_record(asset)
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to store media asset: {e}")
+                        self._memory_media[asset.id] = asset
+        except Exception as e:
+            logger.error(f"Failed to store {len(assets)} media assets: {e}")
+            for asset in assets:
+                self._memory_media[asset.id] = asset
+        return len(assets)
+
     async def get_media_assets(
         self,
         asset_type: Optional[str] = None,
@@ -441,13 +895,13 @@ class DatabaseService:
 
         if thread_id:
             param_count += 1
-            conditions.append(f"thread_id = ${param_count}::uuid")
-            params.append(thread_id)
+            conditions.append(f"thread_id = ${param_count}")
+            params.append(_uuid_param(thread_id))
 
         if user_id:
             param_count += 1
-            conditions.append(f"generated_by = ${param_count}::uuid")
-            params.append(user_id)
+            conditions.append(f"generated_by = ${param_count}")
+            params.append(_uuid_param(user_id))
 
         where_clause = " AND ".join(conditions) if conditions else "1=1"
 
@@ -541,7 +995,7 @@ class DatabaseService:
                     audit.media_assets,
                     audit.commands_executed,
                     audit.status,
-                    json.dumps({}),
+                    {},
                 )
                 return result["id"]
         except Exception as e:
@@ -627,41 +1081,20 @@ class DatabaseService:
 
         try:
             async with self.pool.acquire() as conn:
-                # Get counts
-                total_logs = await conn.fetchval("SELECT COUNT(*) FROM audit_logs")
-                total_media = await conn.fetchval("SELECT COUNT(*) FROM media_assets")
-                total_conversations = await conn.fetchval(
-                    "SELECT COUNT(*) FROM conversation_audits"
-                )
-
-                # Get event type breakdown
-                event_counts = {}
-                rows = await conn.fetch(
-                    """
-                    SELECT event_type, COUNT(*) as count
-                    FROM audit_logs
-                    GROUP BY event_type
-                    """
-                )
-                for row in rows:
-                    event_counts[row["event_type"]] = row["count"]
-
-                # Get media counts
-                video_count = await conn.fetchval(
-                    "SELECT COUNT(*) FROM media_assets WHERE asset_type = 'video'"
-                )
-                image_count = await conn.fetchval(
-                    "SELECT COUNT(*) FROM media_assets WHERE asset_type = 'image'"
-                )
-
-                return {
-                    "total_logs": total_logs,
-                    "total_media_assets": total_media,
-                    "total_conversations": total_conversations,
-                    "event_type_counts": event_counts,
-                    "video_count": video_count,
-                    "image_count": image_count,
-                }
+                async with conn.transaction():
+                    await _set_analytics_timeout(conn)
+                    row = await conn.fetchrow(
+                        STATS_SQL, timeout=DATABASE_ANALYTICS_TIMEOUT
+                    )
+            event_counts = row["event_type_counts"]
+            return {
+                "total_logs": sum(event_counts.values()),
+                "total_media_assets": row["total_media"],
+                "total_conversations": row["total_conversations"],
+                "event_type_counts": event_counts,
+                "video_count": row["video_count"],
+                "image_count": row["image_count"],
+            }
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
             return self._get_memory_stats()
@@ -697,60 +1130,129 @@ class DatabaseService:
     # EXPORT METHODS
     # ========================================================================
 
-    async def export_logs(
+    async def iter_audit_logs(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100000,
+    ) -> AsyncIterator[AuditLog]:
+        """
+        Yield audit logs newest first.
+
+        Rows are read from a server-side cursor EXPORT_PREFETCH at a time,
+        so memory use does not grow with limit.
+
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+            limit: Maximum number of logs to yield
+        """
+        if not self.is_enabled():
+            result = self._query_memory_logs(
+                start_date=start_date, end_date=end_date, page_size=limit
+            )
+            for log in result["logs"]:
+                yield log
+            return
+
+        async for row in self._iter_audit_log_rows("*", start_date, end_date, limit):
+            yield _row_to_audit_log(row)
+
+    async def _iter_audit_log_rows(
+        self,
+        columns: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int,
+    ) -> AsyncIterator[asyncpg.Record]:
+        """Yield audit_logs rows newest first from a server-side cursor."""
+        conditions = []
+        params: List[Any] = []
+        if start_date:
+            params.append(start_date)
+            conditions.append(f"timestamp >= ${len(params)}")
+        if end_date:
+            params.append(end_date)
+            conditions.append(f"timestamp <= ${len(params)}")
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        params.append(limit)
+
+        query = f"""
+            SELECT {columns} FROM audit_logs
+            WHERE {where_clause}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ${len(params)}
+        """
+
+        async with self.pool.acquire() as conn:
+            # Server-side cursors only live inside a transaction
+            async with conn.transaction():
+                await _set_analytics_timeout(conn)
+                cursor = conn.cursor(
+                    query,
+                    *params,
+                    prefetch=EXPORT_PREFETCH,
+                    timeout=DATABASE_ANALYTICS_TIMEOUT,
+                )
+                async for row in cursor:
+                    yield row
+
+    async def export_logs_iter(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         format: str = "json",
         limit: int = 100000,
-    ) -> str:
+    ) -> AsyncIterator[str]:
         """
-        Export audit logs in specified format.
+        Export audit logs newest first.
+
+        JSON is yielded one record per chunk, CSV EXPORT_PREFETCH rows per
+        chunk.
 
         Args:
             start_date: Start date filter
             end_date: End date filter
             format: Export format (json, csv)
             limit: Maximum number of logs to export
-
-        Returns:
-            String representation of exported logs
         """
-        result = await self.query_audit_logs(
-            start_date=start_date,
-            end_date=end_date,
-            page=1,
-            page_size=limit,
-        )
+        if format == "csv" and self.is_enabled():
+            # Database rows go straight to the writer, without building an
+            # AuditLog for each
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(EXPORT_CSV_COLUMNS)
+            rows = self._iter_audit_log_rows(
+                EXPORT_CSV_SELECT, start_date, end_date, limit
+            )
+            count = 0
+            async for row in rows:
+                values = list(row)
+                values[-1] = _dumps(values[-1])  # details
+                writer.writerow(values)
+                count += 1
+                if count % EXPORT_PREFETCH == 0:
+                    yield output.getvalue()
+                    output.seek(0)
+                    output.truncate()
+            yield output.getvalue()
+            return
 
-        logs = result["logs"]
+        logs = self.iter_audit_logs(start_date, end_date, limit)
 
         if format == "json":
-            return json.dumps([log.dict() for log in logs], default=str)
+            yield "["
+            first = True
+            async for log in logs:
+                yield ("" if first else ",") + _dumps(log.dict())
+                first = False
+            yield "]"
 
         elif format == "csv":
-            import io
-
-            import csv
-
             output = io.StringIO()
             writer = csv.writer(output)
-            writer.writerow(
-                [
-                    "id",
-                    "timestamp",
-                    "event_type",
-                    "user_id",
-                    "resource_type",
-                    "resource_id",
-                    "status",
-                    "thread_id",
-                    "post_id",
-                    "ip_address",
-                    "details",
-                ]
-            )
-            for log in logs:
+            writer.writerow(EXPORT_CSV_COLUMNS)
+            async for log in logs:
                 writer.writerow(
                     [
                         log.id,
@@ -763,12 +1265,37 @@ class DatabaseService:
                         log.thread_id,
                         log.post_id,
                         log.ip_address,
-                        json.dumps(log.details),
+                        _dumps(log.details),
                     ]
                 )
-            return output.getvalue()
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+        else:
+            yield str([log.dict() async for log in logs])
+
+    async def export_logs(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        format: str = "json",
+        limit: int = 100000,
+    ) -> str:
+        """
+        Export audit logs in specified format.
 
-        return str([log.dict() for log in logs])
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+            format: Export format (json, csv)
+            limit: Maximum number of logs to export
+
+        Returns:
+            String representation of exported logs
+        """
+        chunks = self.export_logs_iter(start_date, end_date, format, limit)
+        return "".join([chunk async for chunk in chunks])
 
 
 # Global database service instance
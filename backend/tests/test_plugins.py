@@ -0,0 +1,123 @@
+# =============================================================================
+# Agent Twitter - Plugin System Tests
+# =============================================================================
+#
+# Tests for plugin discovery, loading and hook execution
+#
+# =============================================================================
+
+from pathlib import Path
+
+import pytest
+
+from plugins import Plugin, PluginHook, PluginManager
+
+
+PLUGIN_SOURCE = """
+from plugins import Plugin, PluginMetadata, PluginHook, hook
+
+
+class EchoPlugin(Plugin):
+    metadata = PluginMetadata(
+        name="echo",
+        version="0.1.0",
+        description="Echoes post text",
+        author="Tests",
+    )
+
+    @hook(PluginHook.ON_POST_CREATE)
+    def echo(self, post_id, text, author_id):
+        return text
+"""
+
+
+@pytest.fixture
+def plugin_file(tmp_path: Path) -> Path:
+    """Write a minimal plugin module to a temporary directory"""
+    path = tmp_path / "echo_plugin.py"
+    path.write_text(PLUGIN_SOURCE)
+    return path
+
+
+# =============================================================================
+# Discovery Tests
+# =============================================================================
+
+
+class TestPluginDiscovery:
+    """Tests for discovering and loading plugin files"""
+
+    def test_subclasses_are_registered(self):
+        """Test that defining a Plugin subclass registers it"""
+
+        class InlinePlugin(Plugin):
+            pass
+
+        assert Plugin._registry[-1] is InlinePlugin
+
+    def test_discover_plugins(self, plugin_file: Path):
+        """Test that metadata is read from plugin files"""
+        manager = PluginManager()
+        manager.add_plugin_directory(plugin_file.parent)
+
+        discovered = manager.discover_plugins()
+
+        assert [m.name for m in discovered] == ["echo"]
+
+    def test_discover_does_not_instantiate(self, tmp_path: Path):
+        """Test that discovery reads class-level metadata without __init__"""
+        path = tmp_path / "strict_plugin.py"
+        path.write_text(
+            PLUGIN_SOURCE.replace("EchoPlugin", "StrictPlugin")
+            + "\n    def __init__(self):\n        raise RuntimeError('no')\n"
+        )
+        manager = PluginManager()
+        manager.add_plugin_directory(tmp_path)
+
+        assert [m.name for m in manager.discover_plugins()] == ["echo"]
+
+    def test_load_plugin_registers_hooks(self, plugin_file: Path):
+        """Test that loading a plugin wires up its hooks"""
+        manager = PluginManager()
+
+        assert manager.load_plugin(plugin_file)
+        assert manager.is_loaded("echo")
+        assert manager.execute_hook(
+            PluginHook.ON_POST_CREATE, "post-1", "hello", "user-1"
+        ) == ["hello"]
+
+
+# =============================================================================
+# Hook Execution Tests
+# =============================================================================
+
+
+class TestHookExecution:
+    """Tests for dispatching hooks through the manager"""
+
+    def test_failing_hook_is_skipped(self):
+        """Test that a raising hook does not affect the other results"""
+        manager = PluginManager()
+
+        def broken(*args):
+            raise ValueError("boom")
+
+        manager.register_hook(PluginHook.ON_AGENT_LOAD, broken)
+        manager.register_hook(PluginHook.ON_AGENT_LOAD, lambda *args: "ok")
+
+        assert manager.execute_hook(PluginHook.ON_AGENT_LOAD) == ["ok"]
+
+    def test_hook_without_listeners(self):
+        """Test that firing an unused hook returns an empty result"""
+        manager = PluginManager()
+
+        assert manager.execute_hook(PluginHook.ON_THREAD_COMPLETE) == ()
+        assert PluginHook.ON_THREAD_COMPLETE not in manager._hooks
+
+    def test_unload_removes_hooks(self, plugin_file: Path):
+        """Test that unloading a plugin stops its hooks from firing"""
+        manager = PluginManager()
+        manager.load_plugin(plugin_file)
+
+        assert manager.unload_plugin("echo")
+        assert not manager.execute_hook(PluginHook.ON_POST_CREATE, "p", "t", "a")
@@ -6,8 +6,14 @@
 #
 # =============================================================================
 
-import pytest
+import asyncio
+import contextlib
+import os
+import subprocess
+import sys
+import uuid
 
+import pytest
 
 # =============================================================================
 # LLM Service Tests
@@ -99,6 +105,29 @@ class TestMediaService:
         # Should return a list (even if empty)
         assert isinstance(results, list)
 
+    def test_package_exports_singletons_after_submodule_import(self):
+        """Test that importing a submodule first does not shadow its singleton"""
+        code = (
+            "import services.media_service, services.scraping_service, "
+            "services.email_service\n"
+            "from services import media_service, scraping_service, email_service\n"
+            "print(type(media_service).__name__, type(scraping_service).__name__, "
+            "type(email_service).__name__)"
+        )
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=backend_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.split() == [
+            "MediaService",
+            "ScrapingService",
+            "EmailService",
+        ]
+
 
 # =============================================================================
 # Email Service Tests
@@ -140,3 +169,440 @@ class TestScrapingService:
             result = await scraping_service.scrape_text("https://example.com")
             # Should return None when disabled
             assert result is None
+
+
+# =============================================================================
+# Audit Service Tests
+# =============================================================================
+
+
+class RecordingDatabaseService:
+    """Stand-in database service that records the batches it is given"""
+
+    def __init__(self):
+        self.batches = []
+        self.media_assets = []
+
+    async def store_audit_logs_bulk(self, logs):
+        self.batches.append(list(logs))
+        return len(logs)
+
+    async def store_media_assets_bulk(self, assets):
+        self.media_assets.extend(assets)
+        return len(assets)
+
+
+class TestAuditService:
+    """Tests for the audit trail service"""
+
+    @pytest.mark.asyncio
+    async def test_log_event_batches_database_writes(self):
+        """Test that queued logs reach the database as one batch"""
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        db = RecordingDatabaseService()
+        service.set_database_service(db)
+
+        for _ in range(5):
+            await service.log_event(AuditEventType.POST_CREATE, user_id="u1")
+        await service.flush()
+
+        assert [len(batch) for batch in db.batches] == [5]
+
+    @pytest.mark.asyncio
+    async def test_log_event_sync_drops_writes_when_queue_full(self, monkeypatch):
+        """Test that sync logging never blocks on a full write queue"""
+        from services import audit_service as audit_module
+
+        monkeypatch.setattr(audit_module, "AUDIT_QUEUE_SIZE", 2)
+        service = audit_module.AuditService()
+        db = RecordingDatabaseService()
+        service.set_database_service(db)
+
+        asset, _ = service.log_media_generation("image", "https://x/y.png", "a cat")
+        service.log_post_create("p1", "u1", "hello", "t1")
+        await service.flush()
+
+        assert db.media_assets == [asset]
+        assert [len(batch) for batch in db.batches] == [1]
+        assert service.get_stats()["dropped_database_writes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_log_event_drops_writes_when_queue_full(self, monkeypatch):
+        """Test that async logging never waits on a full write queue"""
+        from models import AuditEventType
+        from services import audit_service as audit_module
+
+        monkeypatch.setattr(audit_module, "AUDIT_QUEUE_SIZE", 1)
+        service = audit_module.AuditService()
+        service.set_database_service(RecordingDatabaseService())
+
+        # The writer gets no chance to run in between, so a blocking put
+        # would hang here
+        for _ in range(3):
+            await service.log_event(AuditEventType.POST_CREATE)
+
+        assert service.get_stats()["dropped_database_writes"] == 2
+
+    def test_writer_restarts_on_new_event_loop(self):
+        """Test that queued writes survive a change of event loop"""
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        db = RecordingDatabaseService()
+        service.set_database_service(db)
+
+        async def log_and_flush():
+            service.log_post_create("p1", "u1", "hello", "t1")
+            await service.flush()
+
+        asyncio.run(log_and_flush())
+        asyncio.run(log_and_flush())
+
+        assert [len(batch) for batch in db.batches] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_log_event_sync_from_worker_thread(self):
+        """Test that logs from threads without a loop reach the writer"""
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        db = RecordingDatabaseService()
+        service.set_database_service(db)
+        service.log_post_create("p1", "u1", "hello", "t1")
+
+        await asyncio.to_thread(service.log_post_create, "p2", "u1", "bye", "t1")
+        await asyncio.sleep(0)
+        await service.flush()
+
+        assert sum(len(batch) for batch in db.batches) == 2
+
+    def test_get_logs_sync_combines_filters(self):
+        """Test that every given filter must match"""
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        service.log_event_sync(AuditEventType.POST_CREATE, user_id="u1", thread_id="t1")
+        service.log_event_sync(AuditEventType.POST_CREATE, user_id="u1", thread_id="t2")
+        service.log_event_sync(AuditEventType.POST_DELETE, user_id="u1", thread_id="t1")
+        service.log_event_sync(AuditEventType.POST_CREATE, user_id="u2", thread_id="t1")
+
+        result = service.get_logs_sync(
+            event_type=AuditEventType.POST_CREATE, user_id="u1", thread_id="t1"
+        )
+
+        assert result["total_count"] == 1
+        assert result["logs"][0].thread_id == "t1"
+
+    def test_clear_logs_updates_indexes(self):
+        """Test that cleared logs no longer match indexed filters"""
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        service.log_event_sync(AuditEventType.POST_CREATE, user_id="u1")
+        service.log_event_sync(AuditEventType.POST_DELETE, user_id="u1")
+
+        assert service.clear_logs(event_type=AuditEventType.POST_CREATE) == 1
+        assert service.get_logs_sync(user_id="u1")["total_count"] == 1
+        assert AuditEventType.POST_CREATE not in service._by_event_type
+        assert service.get_stats()["event_type_counts"] == {"post_delete": 1}
+
+    def test_cache_evicts_oldest_logs(self, monkeypatch):
+        """Test that the in-memory cache is capped at the newest logs"""
+        from models import AuditEventType
+        from services import audit_service as audit_module
+
+        monkeypatch.setattr(audit_module, "AUDIT_CACHE_MAX_LOGS", 3)
+        service = audit_module.AuditService()
+        logs = [
+            service.log_event_sync(AuditEventType.POST_CREATE, user_id="u1")
+            for _ in range(5)
+        ]
+
+        result = service.get_logs_sync(user_id="u1")
+        assert [log.id for log in result["logs"]] == [log.id for log in logs[:1:-1]]
+
+    def test_export_logs(self):
+        """Test exporting cached logs as JSON and CSV"""
+        import json
+
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        log = service.log_event_sync(AuditEventType.POST_CREATE, user_id="u1")
+
+        assert [entry["id"] for entry in json.loads(service.export_logs())] == [log.id]
+        assert (
+            service.export_logs(format="csv")
+            .splitlines()[1]
+            .endswith("post_create,u1,,,success,")
+        )
+
+    @pytest.mark.asyncio
+    async def test_export_logs_aiter_reads_healthy_database(self):
+        """Test that the async export streams logs from a healthy database"""
+        import json
+
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        stored = AuditService().log_event_sync(AuditEventType.POST_CREATE)
+
+        class ExportDatabaseService(RecordingDatabaseService):
+            async def health_check(self):
+                return True
+
+            async def iter_audit_logs(self, start_date, end_date, limit):
+                yield stored
+
+        service = AuditService()
+        service.set_database_service(ExportDatabaseService())
+        cached = service.log_event_sync(AuditEventType.POST_CREATE)
+        await service.flush()
+
+        chunks = [chunk async for chunk in service.export_logs_aiter()]
+
+        assert [entry["id"] for entry in json.loads("".join(chunks))] == [stored.id]
+        assert cached.id != stored.id
+
+    @pytest.mark.asyncio
+    async def test_search_matches_details_and_errors(self):
+        """Test that the search query matches details and error messages"""
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        service.log_event_sync(AuditEventType.POST_CREATE, details={"text": "Hello"})
+        service.log_event_sync(
+            AuditEventType.COMMAND_FAILED, status="failed", error_message="HELLO"
+        )
+        service.log_event_sync(AuditEventType.POST_CREATE, details={"text": "bye"})
+
+        result = await service.get_logs(search_query="hello")
+
+        assert result["total_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_logs_cursor_matches_page_numbers(self):
+        """Test that following next_cursor returns the same logs as pages"""
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        for i in range(7):
+            service.log_event_sync(AuditEventType.POST_CREATE, resource_id=str(i))
+
+        by_page = []
+        for page in (1, 2, 3):
+            result = await service.get_logs(page=page, page_size=3)
+            by_page += [log.id for log in result["logs"]]
+
+        by_cursor = []
+        result = await service.get_logs(page_size=3)
+        while True:
+            by_cursor += [log.id for log in result["logs"]]
+            if not result["next_cursor"]:
+                break
+            timestamp, log_id = result["next_cursor"]
+            result = await service.get_logs(
+                page_size=3, after_timestamp=timestamp, after_id=log_id
+            )
+
+        assert len(by_cursor) == 7
+        assert by_cursor == by_page
+
+    @pytest.mark.asyncio
+    async def test_get_logs_accepts_timezone_aware_cursor(self, monkeypatch):
+        """Test that a cursor from the database (timestamptz) pages the cache"""
+        import time
+        from datetime import timedelta, timezone
+
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        # The cache holds naive local times: use a zone that is not UTC
+        monkeypatch.setenv("TZ", "Asia/Kolkata")
+        time.tzset()
+        try:
+            service = AuditService()
+            for i in range(3):
+                service.log_event_sync(AuditEventType.POST_CREATE, resource_id=str(i))
+            newest = (await service.get_logs(page_size=1))["logs"][0]
+
+            aware = newest.timestamp.astimezone() + timedelta(microseconds=1)
+            result = await service.get_logs(
+                page_size=3, after_timestamp=aware, after_id=newest.id
+            )
+            assert len(result["logs"]) == 3
+
+            aware = newest.timestamp.astimezone(timezone(timedelta(hours=-7)))
+            result = await service.get_logs(
+                page_size=3, after_timestamp=aware, after_id=newest.id
+            )
+            assert newest.id not in [log.id for log in result["logs"]]
+            assert len(result["logs"]) == 2
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+    @pytest.mark.asyncio
+    async def test_get_logs_by_correlation_id(self):
+        """Test filtering logs by their correlation and request IDs"""
+        from models import AuditEventType
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        traced = service.log_event_sync(
+            AuditEventType.POST_CREATE, correlation_id="abc", request_id="abc"
+        )
+        service.log_event_sync(AuditEventType.POST_CREATE, correlation_id="def")
+
+        result = await service.get_logs(correlation_id="abc")
+        assert [log.id for log in result["logs"]] == [traced.id]
+        result = await service.get_logs(request_id="abc")
+        assert [log.id for log in result["logs"]] == [traced.id]
+
+    def test_update_conversation_audit_skips_duplicates(self):
+        """Test that conversation audit lists keep each value once, in order"""
+        from services.audit_service import AuditService
+
+        service = AuditService()
+        service.update_conversation_audit("t1", participant_id="u1", command="/a")
+        service.update_conversation_audit("t1", participant_id="u2", command="/a")
+        service.update_conversation_audit("t1", participant_id="u1", agent_handle="u1")
+
+        audit = service.get_conversation_audit("t1")
+        assert audit.participant_ids == ["u1", "u2"]
+        assert audit.agent_handles == ["u1"]
+        assert audit.commands_executed == ["/a"]
+
+
+# =============================================================================
+# Database Service Tests
+# =============================================================================
+
+
+class UUIDCheckingConnection:
+    """Stand-in asyncpg connection that rejects rows with a non-UUID resource_id"""
+
+    def __init__(self):
+        self.stored = []
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        committed = list(self.stored)
+        try:
+            yield
+        except Exception:
+            self.stored = committed  # Roll back
+            raise
+
+    async def executemany(self, query, records):
+        for record in records:
+            await self.execute(query, *record)
+
+    async def execute(self, query, *record):
+        resource_id = record[8]
+        if resource_id is not None:
+            uuid.UUID(resource_id)  # ValueError, like Postgres' uuid input
+        self.stored.append(record[0])
+
+    async def copy_records_to_table(self, table, records, columns):
+        async with self.transaction():
+            await self.executemany(None, records)
+
+
+class FakePool:
+    """Stand-in asyncpg pool that hands out one connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+class TestDatabaseService:
+    """Tests for the PostgreSQL audit storage"""
+
+    @pytest.mark.asyncio
+    async def test_store_audit_logs_bulk_keeps_good_rows_of_failed_batch(self):
+        """Test that one bad row in a batch does not keep the others out"""
+        from datetime import datetime
+
+        from models import AuditEventType, AuditLog
+        from services.database_service import DatabaseService
+
+        def make_log(resource_id):
+            return AuditLog(
+                id=str(uuid.uuid4()),
+                timestamp=datetime.now(),
+                event_type=AuditEventType.POST_CREATE,
+                resource_id=resource_id,
+            )
+
+        good = [make_log(str(uuid.uuid4())), make_log(None)]
+        bad = make_log("/api/posts")
+        conn = UUIDCheckingConnection()
+        db = DatabaseService()
+        db._enabled = True
+        db.pool = FakePool(conn)
+
+        assert await db.store_audit_logs_bulk([good[0], bad, good[1]]) == 3
+        assert conn.stored == [log.id for log in good]
+        assert list(db._memory_logs) == [bad.id]
+
+    @pytest.mark.asyncio
+    async def test_copy_audit_logs_falls_back_when_copy_fails(self):
+        """Test that a row COPY rejects does not keep the other logs out"""
+        from datetime import datetime
+
+        from models import AuditEventType, AuditLog
+        from services.database_service import DatabaseService
+
+        def make_log(resource_id):
+            return AuditLog(
+                id=str(uuid.uuid4()),
+                timestamp=datetime.now(),
+                event_type=AuditEventType.COMMAND_EXECUTED,
+                resource_id=resource_id,
+            )
+
+        good = make_log(str(uuid.uuid4()))
+        bad = make_log("summarize")
+        conn = UUIDCheckingConnection()
+        db = DatabaseService()
+        db._enabled = True
+        db.pool = FakePool(conn)
+
+        assert await db.copy_audit_logs([good, bad]) == 2
+        assert conn.stored == [good.id]
+        assert list(db._memory_logs) == [bad.id]
+
+    def test_memory_logs_are_bounded(self, monkeypatch):
+        """Test that the in-memory fallback evicts its oldest logs"""
+        from datetime import datetime
+
+        from models import AuditEventType, AuditLog
+        from services import database_service as database_module
+
+        monkeypatch.setattr(database_module, "MEMORY_MAX_LOGS", 2)
+        db = database_module.DatabaseService()
+        logs = [
+            AuditLog(
+                id=str(i),
+                timestamp=datetime.now(),
+                event_type=AuditEventType.POST_CREATE,
+            )
+            for i in range(3)
+        ]
+        for log in logs:
+            db._remember_log(log)
+
+        assert list(db._memory_logs) == ["1", "2"]